@@ -1,17 +1,18 @@
-import sqlite3
 import os
 import logging
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Tuple
+import sys
+
+# The shared logging and database helpers live at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from logging_setup import setup_queue_logging
+from logs_db import LogsDatabase, build_keyword_filter
 
 # Configure logging for tracking script activities
-logging.basicConfig(
-    filename="cleaner.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+setup_queue_logging("cleaner.log")
 
-class LogCleaner:
+class LogCleaner(LogsDatabase):
     def __init__(self, db_name="logs.db"):
         """
         Initializes the LogCleaner with a connection to the SQLite database.
@@ -19,10 +20,10 @@ class LogCleaner:
         Args:
             db_name (str): The name of the SQLite database (default is 'logs.db').
         """
-        self.db_name = db_name
-        self.conn = sqlite3.connect(self.db_name)
-        self.cursor = self.conn.cursor()
-        logging.info(f"Connected to database {db_name}.")
+        super().__init__(db_name)
+        if self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'logs'").fetchone():
+            self._create_fts_index()
+        logging.info("Connected to database %s.", db_name)
 
     def remove_old_logs(self, days_threshold: int = 30):
         """
@@ -39,8 +40,8 @@ class LogCleaner:
             WHERE timestamp < ?
         """, (cutoff_date_str,))
         
-        self.conn.commit()
-        logging.info(f"Removed logs older than {cutoff_date_str}.")
+        self._commit()
+        logging.info("Removed logs older than %s.", cutoff_date_str)
 
     def remove_irrelevant_logs(self, keywords: List[str], log_levels: List[str]):
         """
@@ -50,64 +51,91 @@ class LogCleaner:
             keywords (List[str]): List of keywords to search for and remove from logs.
             log_levels (List[str]): List of log levels to remove from logs.
         """
-        keyword_conditions = " OR ".join([f"message LIKE ?" for _ in keywords])
-        log_level_conditions = " OR ".join([f"log_level = ?" for _ in log_levels])
+        keyword_condition, parameters = build_keyword_filter(keywords)
+
+        conditions = [keyword_condition] if keyword_condition else []
+        if log_levels:
+            conditions.append(f"log_level IN ({','.join('?' * len(log_levels))})")
+            parameters += log_levels
+        if not conditions:
+            return
 
         query = f"""
             DELETE FROM logs
-            WHERE ({keyword_conditions}) OR ({log_level_conditions})
+            WHERE {" OR ".join(conditions)}
         """
 
-        # Prepare parameters for the query
-        parameters = [f"%{keyword}%" for keyword in keywords] + log_levels
-
         self.cursor.execute(query, tuple(parameters))
-        self.conn.commit()
-        logging.info(f"Removed logs containing keywords {keywords} or with log levels {log_levels}.")
+        self._commit()
+        logging.info("Removed logs containing keywords %s or with log levels %s.", keywords, log_levels)
 
     def clean_logs_in_batches(self, batch_size: int = 1000):
         """
-        Cleans logs by processing and filtering logs in batches.
-        
+        Cleans logs by deleting the ones rejected by `filter_logs` (INFO level or mentioning 'debug').
+
+        The rejected ids are selected once inside SQLite, then deleted `batch_size` rows per
+        transaction, so no single transaction (or the write-ahead log) grows with the table
+        and readers see progress between batches.
+
         Args:
-            batch_size (int): The size of each batch for processing (default is 1000).
+            batch_size (int): The number of logs deleted per transaction.
         """
-        offset = 0
+        keyword_condition, parameters = build_keyword_filter(["debug"])
+
+        with self.transaction():
+            self.cursor.execute("CREATE TEMP TABLE IF NOT EXISTS rejected_logs (id INTEGER PRIMARY KEY)")
+            self.cursor.execute("DELETE FROM rejected_logs")
+            self.cursor.execute(f"""
+                INSERT INTO rejected_logs
+                SELECT id FROM logs
+                WHERE upper(log_level) = 'INFO' OR {keyword_condition}
+            """, tuple(parameters))
+
+        cleaned = 0
         while True:
-            # Fetch a batch of logs
-            logs = self.fetch_logs(limit=batch_size, offset=offset)
-            if not logs:
-                break
-
-            # Apply cleaning to the batch
-            cleaned_logs = self.filter_logs(logs)
-
-            # Re-insert cleaned logs back into the database
-            self.reinsert_logs(cleaned_logs)
-
-            # Update offset for the next batch
-            offset += batch_size
-            logging.info(f"Processed and cleaned batch starting from offset {offset}.")
-
-    def fetch_logs(self, limit: int = 1000, offset: int = 0) -> List[dict]:
+            with self.transaction():
+                # Both statements take the batch_size lowest ids, so they remove the same batch
+                self.cursor.execute("""
+                    DELETE FROM logs
+                    WHERE id IN (SELECT id FROM rejected_logs ORDER BY id LIMIT ?)
+                """, (batch_size,))
+                cleaned += self.cursor.rowcount
+                self.cursor.execute("""
+                    DELETE FROM rejected_logs
+                    WHERE id IN (SELECT id FROM rejected_logs ORDER BY id LIMIT ?)
+                """, (batch_size,))
+                if self.cursor.rowcount == 0:
+                    break
+
+        logging.info("Cleaned %s logs.", cleaned)
+
+    def fetch_logs(self, limit: int = 1000, after_id: int = 0) -> Tuple[List[dict], int]:
         """
         Fetches logs from the database in a paginated manner (useful for large datasets).
+
+        Uses keyset pagination on the primary key, so each page costs the same no matter
+        how deep into the table it is. Pass the returned id back as `after_id` to get the
+        next page.
         
         Args:
             limit (int): The number of logs to fetch per query.
-            offset (int): The offset for pagination.
+            after_id (int): Only fetch logs with an id greater than this (0 for the first page).
         
         Returns:
-            List[dict]: A list of logs.
+            Tuple[List[dict], int]: A list of logs and the largest id in it (or `after_id` if empty).
         """
         self.cursor.execute("""
             SELECT id, timestamp, log_level, message
             FROM logs
-            LIMIT ? OFFSET ?
-        """, (limit, offset))
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (after_id, limit))
         
         rows = self.cursor.fetchall()
-        return [{"id": row[0], "timestamp": row[1], "log_level": row[2], "message": row[3]} for row in rows]
+        logs = [{"id": row[0], "timestamp": row[1], "log_level": row[2], "message": row[3]} for row in rows]
+        last_id = rows[-1][0] if rows else after_id
+        return logs, last_id
 
     def filter_logs(self, logs: List[dict]) -> List[dict]:
         """
@@ -136,17 +164,23 @@ class LogCleaner:
             logs (List[dict]): A list of cleaned logs to insert.
         """
         if logs:
+            # An upsert (rather than INSERT OR REPLACE) fires the UPDATE trigger that keeps
+            # the full-text index in sync
             self.cursor.executemany("""
-                INSERT OR REPLACE INTO logs (id, timestamp, log_level, message)
+                INSERT INTO logs (id, timestamp, log_level, message)
                 VALUES (:id, :timestamp, :log_level, :message)
+                ON CONFLICT(id) DO UPDATE SET
+                    timestamp = excluded.timestamp,
+                    log_level = excluded.log_level,
+                    message = excluded.message
             """, logs)
-            self.conn.commit()
-            logging.info(f"Re-inserted {len(logs)} cleaned logs into the database.")
+            self._commit()
+            logging.info("Re-inserted %s cleaned logs into the database.", len(logs))
 
     def close(self):
         """Close the database connection."""
-        self.conn.close()
-        logging.info(f"Closed the connection to the database {self.db_name}.")
+        super().close()
+        logging.info("Closed the connection to the database %s.", self.db_name)
 
 
 if __name__ == "__main__":
@@ -154,20 +188,22 @@ if __name__ == "__main__":
     log_cleaner = LogCleaner(db_name="logs.db")
 
     try:
-        # Clean old logs (older than 30 days by default)
-        log_cleaner.remove_old_logs(days_threshold=30)
+        # Run both deletions in one transaction
+        with log_cleaner.transaction():
+            # Clean old logs (older than 30 days by default)
+            log_cleaner.remove_old_logs(days_threshold=30)
 
-        # Clean logs based on irrelevant keywords and log levels
-        log_cleaner.remove_irrelevant_logs(
-            keywords=["health_check", "debug"],
-            log_levels=["INFO", "DEBUG"]
-        )
+            # Clean logs based on irrelevant keywords and log levels
+            log_cleaner.remove_irrelevant_logs(
+                keywords=["health_check", "debug"],
+                log_levels=["INFO", "DEBUG"]
+            )
 
         # Process logs in batches and clean them
         log_cleaner.clean_logs_in_batches(batch_size=1000)
 
     except Exception as e:
-        logging.error(f"Error during log cleaning: {e}")
+        logging.error("Error during log cleaning: %s", e)
 
     finally:
         # Close the database connection
@@ -1,5 +1,26 @@
 import re
 from datetime import datetime
+import pandas as pd
+
+try:
+    # google-re2 compiles to a linear-time DFA with no backtracking
+    import re2 as _regex
+except ImportError:
+    _regex = re
+
+# Patterns are compiled once at import time and shared by every call.
+# General log regex with optional timestamp
+_LOG_RE = _regex.compile(
+    r"(?:(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s)?(ERROR|WARNING|INFO):\s(.+)"
+)
+# Matches IPv4 addresses
+_IP_RE = _regex.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b")
+# Commonly follows patterns like 'E123', 'ERR_456', etc.
+_ERR_RE = _regex.compile(r"\b(E\d{3,4}|ERR_\d+)\b")
+# IP addresses and error codes in a single pass
+_IP_OR_ERR_RE = _regex.compile(
+    r"\b(?:(?P<ip>(?:\d{1,3}\.){3}\d{1,3})|(?P<error_code>E\d{3,4}|ERR_\d+))\b"
+)
 
 
 def parse_log(log_entry):
@@ -16,30 +37,27 @@ def parse_log(log_entry):
     Returns:
         dict: Parsed log details.
     """
-    # General log regex with optional timestamp
-    log_pattern = re.compile(
-        r"(?:(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s)?(ERROR|WARNING|INFO):\s(.+)"
-    )
-
-    match = log_pattern.match(log_entry)
+    match = _LOG_RE.match(log_entry)
     if match:
         timestamp, level, message = match.groups()
+        ip_addresses, error_codes = extract_ip_addresses_and_error_codes(message)
         log_details = {
             "timestamp": timestamp or "N/A",
             "level": level,
             "message": message.strip(),
-            "ip_addresses": extract_ip_addresses(message),
-            "error_codes": extract_error_codes(message),
+            "ip_addresses": ip_addresses,
+            "error_codes": error_codes,
         }
         return log_details
 
     # Fallback for logs that don't match the main pattern
+    ip_addresses, error_codes = extract_ip_addresses_and_error_codes(log_entry)
     return {
         "timestamp": "N/A",
         "level": "UNKNOWN",
         "message": log_entry.strip(),
-        "ip_addresses": extract_ip_addresses(log_entry),
-        "error_codes": extract_error_codes(log_entry),
+        "ip_addresses": ip_addresses,
+        "error_codes": error_codes,
     }
 
 
@@ -50,10 +68,7 @@ def extract_ip_addresses(text):
     Returns:
         list: A list of extracted IP addresses.
     """
-    ip_pattern = re.compile(
-        r"\b(?:\d{1,3}\.){3}\d{1,3}\b"
-    )  # Matches IPv4 addresses
-    return ip_pattern.findall(text)
+    return _IP_RE.findall(text)
 
 
 def extract_error_codes(text):
@@ -64,8 +79,25 @@ def extract_error_codes(text):
     Returns:
         list: A list of extracted error codes.
     """
-    error_code_pattern = re.compile(r"\b(E\d{3,4}|ERR_\d+)\b")
-    return error_code_pattern.findall(text)
+    return _ERR_RE.findall(text)
+
+
+def extract_ip_addresses_and_error_codes(text):
+    """
+    Extract IP addresses and error codes from the given text in a single scan.
+
+    Returns:
+        tuple: (list of IP addresses, list of error codes).
+    """
+    ip_addresses = []
+    error_codes = []
+    for match in _IP_OR_ERR_RE.finditer(text):
+        ip, error_code = match.group("ip", "error_code")
+        if ip is not None:
+            ip_addresses.append(ip)
+        else:
+            error_codes.append(error_code)
+    return ip_addresses, error_codes
 
 
 def parse_timestamp(timestamp):
@@ -89,14 +121,48 @@ def parse_batch_logs(log_entries):
     Parse a batch of log entries.
 
     Args:
-        log_entries (list): List of log entries.
+        log_entries (list or str): List of log entries, or a single buffer
+            holding one log entry per line (e.g. a whole file read at once).
 
     Returns:
         list: List of parsed log details.
     """
+    if isinstance(log_entries, str):
+        log_entries = log_entries.splitlines()
     return [parse_log(log_entry) for log_entry in log_entries]
 
 
+def parse_batch_logs_vec(log_entries):
+    """
+    Parse a batch of log entries with vectorized pandas string operations.
+
+    Produces the same fields as `parse_log`, but runs the regex work over
+    the whole batch at once instead of calling `parse_log` per entry.
+
+    Args:
+        log_entries (pd.Series or list): Log entries to parse.
+
+    Returns:
+        pd.DataFrame: One row per entry with columns timestamp, level,
+        message, ip_addresses and error_codes.
+    """
+    entries = pd.Series(log_entries, dtype="object")
+    fields = entries.str.extract("^" + _LOG_RE.pattern)
+    fields.columns = ["timestamp", "level", "message"]
+
+    # Entries that don't match the main pattern keep the whole line as message
+    matched = fields["level"].notna()
+    text = fields["message"].where(matched, entries)
+
+    return pd.DataFrame({
+        "timestamp": fields["timestamp"].fillna("N/A"),
+        "level": fields["level"].fillna("UNKNOWN"),
+        "message": text.str.strip(),
+        "ip_addresses": text.str.findall(_IP_RE.pattern),
+        "error_codes": text.str.findall(_ERR_RE.pattern),
+    })
+
+
 # Example Usage
 if __name__ == "__main__":
     sample_logs = [
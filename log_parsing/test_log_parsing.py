@@ -0,0 +1,115 @@
+import os
+import json
+import tempfile
+import unittest
+
+import pandas as pd
+from test_parser import LogParser
+from parser import (
+    parse_log, parse_batch_logs, parse_batch_logs_vec,
+    extract_ip_addresses, extract_error_codes, extract_ip_addresses_and_error_codes,
+)
+
+SAMPLE_LOGS = [
+    "2024-12-19 14:22:31 ERROR: Packet loss detected between Node A and Node B.",
+    "2024-12-19 14:25:12 WARNING: High latency observed in region X.",
+    "INFO: Network maintenance scheduled.",
+    "ERROR: Connection timeout (IP: 192.168.1.1, Error Code: ERR_503).",
+    "WARNING: E1234 from 10.0.0.1 and 10.0.0.2, then E12 and E12345 and ERR_7",
+    "ERROR: 10.0.0.1E123 E123.4.5.6 1.2.3.4.5 ERR_1ERR_2 999.999.999.999 ",
+    "2024-12-19 14:22:31 INFO:   padded message   ",
+    "Invalid log entry without format, from 172.16.0.9 (E404).",
+    "",
+]
+
+
+class TestLogParser(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Run each test in a throwaway directory, since the parser writes filtered_logs.csv
+        to the working directory.
+        """
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpdir.name)
+        self.addCleanup(self.tmpdir.cleanup)
+        self.addCleanup(os.chdir, self.cwd)
+
+    def write_log(self, entries):
+        with open("log.jsonl", "w") as file:
+            file.write("\n".join(json.dumps(entry) for entry in entries) + "\n")
+
+    def test_parse_logs_keeps_errors_and_warnings(self):
+        """
+        Test that only ERROR and WARNING entries are written, across several batches.
+        """
+        self.write_log([
+            {"timestamp": "2024-12-19 12:00:00", "level": "ERROR", "message": "Link down"},
+            {"timestamp": "2024-12-19 12:00:01", "level": "INFO", "message": "Link up"},
+            {"timestamp": "2024-12-19 12:00:02", "level": "WARNING", "message": "High latency"},
+        ])
+        parser = LogParser("log.jsonl", batch_size=2)
+        parser.parse_logs()
+
+        df = pd.read_csv(parser.output_file)
+        self.assertEqual(df["message"].tolist(), ["Link down", "High latency"])
+        self.assertEqual(parser.get_stats()["filtered_logs"], 2)
+
+    def test_parse_logs_with_non_string_fields(self):
+        """
+        Test that numeric and other non-string JSON values are written as text instead
+        of failing the batch.
+        """
+        self.write_log([
+            {"timestamp": 1700000000, "level": "ERROR", "message": "Link down"},
+            {"timestamp": "2024-12-19 12:00:01", "level": "WARNING", "message": 404},
+            {"timestamp": None, "level": "ERROR", "message": {"code": 7}},
+        ])
+        parser = LogParser("log.jsonl")
+        parser.parse_logs()
+
+        df = pd.read_csv(parser.output_file, dtype=str, keep_default_na=False)
+        self.assertEqual(df["timestamp"].tolist(), ["1700000000", "2024-12-19 12:00:01", ""])
+        self.assertEqual(df["message"].tolist(), ["Link down", "404", "{'code': 7}"])
+        self.assertEqual(parser.get_stats()["filtered_logs"], 3)
+
+
+class TestParser(unittest.TestCase):
+
+    def test_single_scan_matches_separate_extractors(self):
+        """
+        Test that the combined IP/error code scan finds what the two separate scans found.
+        """
+        for entry in SAMPLE_LOGS:
+            self.assertEqual(
+                extract_ip_addresses_and_error_codes(entry),
+                (extract_ip_addresses(entry), extract_error_codes(entry)),
+                entry
+            )
+
+    def test_parse_log_fields(self):
+        """
+        Test the fields parsed from matching and non-matching entries.
+        """
+        self.assertEqual(parse_log(SAMPLE_LOGS[3]), {
+            "timestamp": "N/A",
+            "level": "ERROR",
+            "message": "Connection timeout (IP: 192.168.1.1, Error Code: ERR_503).",
+            "ip_addresses": ["192.168.1.1"],
+            "error_codes": ["ERR_503"],
+        })
+        self.assertEqual(parse_log(SAMPLE_LOGS[7])["level"], "UNKNOWN")
+        self.assertEqual(parse_log(SAMPLE_LOGS[7])["error_codes"], ["E404"])
+
+    def test_parse_batch_logs_vec_matches_parse_batch_logs(self):
+        """
+        Test that the vectorized batch parser gives the same rows as parsing entry by entry.
+        """
+        expected = parse_batch_logs(SAMPLE_LOGS)
+        self.assertEqual(parse_batch_logs_vec(SAMPLE_LOGS).to_dict(orient="records"), expected)
+        self.assertEqual(parse_batch_logs("\n".join(SAMPLE_LOGS[:-1])), expected[:-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
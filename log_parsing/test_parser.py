@@ -6,10 +6,36 @@ from datetime import datetime
 from collections import defaultdict
 import pandas as pd
 
+try:
+    # orjson is a C extension and parses JSON several times faster than json
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+if pa is not None:
+    FILTERED_LOG_SCHEMA = pa.schema([
+        ("timestamp", pa.string()),
+        ("level", pa.string()),
+        ("message", pa.string())
+    ])
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+def as_text(values: list) -> list:
+    """
+    Convert JSON values that are not strings (numbers, booleans, nested objects) to
+    their text form, as the CSV writer would, keeping missing values missing.
+    """
+    return [value if value is None or isinstance(value, str) else str(value) for value in values]
+
 class LogParser:
     def __init__(self, file_path: str, batch_size: int = 10000):
         """
@@ -22,13 +48,18 @@ class LogParser:
         self.file_path = file_path
         self.batch_size = batch_size
         self.total_logs = 0
-        self.filtered_logs = []
+        self.failed_logs = 0
+        self.filtered_count = 0
+        # Filtered logs are written out batch by batch instead of being kept in memory
+        self.output_file = "filtered_logs.csv"
+        self._writer = None
 
     def parse_logs(self):
         """
-        Parses the log file in batches, processes each batch, and stores relevant logs.
+        Parses the log file in batches, processes each batch, and writes relevant logs.
 
-        This method reads logs line by line to avoid memory overload with large files.
+        This method reads logs line by line and appends each batch's filtered logs to the
+        output CSV, so memory use is bounded by the batch size rather than the file size.
         """
         logger.info(f"Parsing log file: {self.file_path}")
         
@@ -46,13 +77,13 @@ class LogParser:
                 # Process any remaining lines after the loop
                 if batch:
                     self.process_batch(batch)
-            
-            # After parsing, export or handle filtered logs
-            self.export_filtered_logs()
 
         except Exception as e:
             logger.error(f"Error while parsing logs: {e}")
 
+        finally:
+            self.close_writer()
+
     def process_batch(self, batch: List[str]):
         """
         Processes each batch of log entries. It filters and parses the logs into a structured format.
@@ -62,14 +93,42 @@ class LogParser:
         """
         logger.info(f"Processing a batch of {len(batch)} logs.")
 
-        for log_entry in batch:
-            try:
-                parsed_log = self.parse_log_entry(log_entry)
+        # Filtered logs for this batch, kept column by column
+        timestamps = []
+        levels = []
+        messages = []
+
+        # Bind lookups once; parse_log_entry already returns None on failure,
+        # so the loop itself needs no per-entry exception handling.
+        append_timestamp = timestamps.append
+        append_level = levels.append
+        append_message = messages.append
+        parse = self.parse_log_entry
+        failed_before = self.failed_logs
+        kept = 0
+
+        try:
+            for log_entry in batch:
+                parsed_log = parse(log_entry)
                 if parsed_log:
-                    self.filtered_logs.append(parsed_log)
-                    self.total_logs += 1
-            except Exception as e:
-                logger.error(f"Error processing log entry: {log_entry}. Error: {e}")
+                    timestamp, level, message = parsed_log
+                    append_timestamp(timestamp)
+                    append_level(level)
+                    append_message(message)
+                    kept += 1
+        except Exception as e:
+            logger.error(f"Error processing batch: {e}")
+
+        self.total_logs += kept
+        failed = self.failed_logs - failed_before
+        if failed:
+            logger.warning(f"Failed to parse {failed} log entries in this batch.")
+
+        # A batch that cannot be written is reported and skipped; later batches still are
+        try:
+            self.write_batch(timestamps, levels, messages)
+        except Exception as e:
+            logger.error(f"Error writing batch: {e}")
 
     def parse_log_entry(self, log_entry: str) -> dict:
         """
@@ -79,11 +138,11 @@ class LogParser:
             log_entry (str): A single log entry in text form.
 
         Returns:
-            dict: A parsed log entry or None if the entry is irrelevant.
+            tuple: A parsed (timestamp, level, message) entry or None if the entry is irrelevant.
         """
         try:
             # Example parsing logic: Let's assume the log is in JSON format or follows a certain structure.
-            log_data = json.loads(log_entry)  # For JSON logs
+            log_data = json_loads(log_entry)  # For JSON logs
 
             # Example: A log entry might have 'timestamp', 'level', and 'message'
             timestamp = log_data.get("timestamp")
@@ -91,33 +150,55 @@ class LogParser:
             message = log_data.get("message")
 
             # Filtering: Only keep logs with 'ERROR' or 'WARNING' level
-            if level in ['ERROR', 'WARNING']:
-                return {
-                    "timestamp": timestamp,
-                    "level": level,
-                    "message": message
-                }
+            if level in ('ERROR', 'WARNING'):
+                return timestamp, level, message
             else:
                 return None
 
         except Exception as e:
-            logger.warning(f"Failed to parse log entry: {log_entry}. Error: {e}")
+            self.failed_logs += 1
+            logger.debug(f"Failed to parse log entry: {log_entry}. Error: {e}")
             return None
 
-    def export_filtered_logs(self):
+    def write_batch(self, timestamps: List[str], levels: List[str], messages: List[str]):
         """
-        Export the filtered logs into a CSV or other formats for further analysis.
+        Append one batch of filtered logs to the output CSV.
+
+        The CSV is written with pyarrow's incremental CSV writer, falling back to pandas in
+        append mode when pyarrow is not installed.
 
-        This method will convert the filtered logs to a pandas DataFrame and export it as a CSV.
+        Args:
+            timestamps (List[str]): Timestamps of the filtered logs.
+            levels (List[str]): Levels of the filtered logs.
+            messages (List[str]): Messages of the filtered logs.
         """
-        if self.filtered_logs:
-            # Convert filtered logs to a DataFrame
-            df = pd.DataFrame(self.filtered_logs)
-
-            # Save to CSV
-            output_file = "filtered_logs.csv"
-            df.to_csv(output_file, index=False)
-            logger.info(f"Exported {len(self.filtered_logs)} filtered logs to {output_file}")
+        if not levels:
+            return
+
+        if pa is not None:
+            if self._writer is None:
+                self._writer = pacsv.CSVWriter(self.output_file, FILTERED_LOG_SCHEMA)
+            self._writer.write_batch(pa.record_batch(
+                [pa.array(as_text(column), pa.string()) for column in (timestamps, levels, messages)],
+                schema=FILTERED_LOG_SCHEMA
+            ))
+        else:
+            df = pd.DataFrame({"timestamp": timestamps, "level": levels, "message": messages})
+            first_batch = self.filtered_count == 0
+            df.to_csv(self.output_file, mode="w" if first_batch else "a", header=first_batch, index=False)
+
+        self.filtered_count += len(levels)
+
+    def close_writer(self):
+        """
+        Close the output CSV once parsing is finished.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        if self.filtered_count:
+            logger.info(f"Exported {self.filtered_count} filtered logs to {self.output_file}")
         else:
             logger.info("No filtered logs to export.")
 
@@ -130,7 +211,8 @@ class LogParser:
         """
         return {
             "total_logs_processed": self.total_logs,
-            "filtered_logs": len(self.filtered_logs)
+            "filtered_logs": self.filtered_count,
+            "failed_logs": self.failed_logs
         }
 
 # Example of usage
@@ -0,0 +1,47 @@
+import atexit
+import queue
+import logging
+import logging.handlers
+
+# Layout of every line written to the log files
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+def setup_queue_logging(filename: str, level: int = logging.INFO):
+    """
+    Configure the root logger to write to `filename` without blocking the caller.
+
+    Records go through a queue to a background listener thread that writes the file,
+    so logging calls never block on disk I/O. The listener is stopped (and the queue
+    drained) at exit. Like logging.basicConfig(), this does nothing if the root logger
+    already has handlers.
+
+    Args:
+        filename (str): Path of the log file.
+        level (int): Lowest level to log (default: logging.INFO).
+    """
+    if logging.getLogger().handlers:
+        return
+
+    log_queue = queue.Queue(-1)
+    file_handler = logging.FileHandler(filename, delay=True)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    # The queue handler only merges the message arguments; the file handler applies the layout
+    logging.basicConfig(level=level, format="%(message)s", handlers=[logging.handlers.QueueHandler(log_queue)])
+
+
+def setup_file_logging(filename: str, level: int = logging.INFO):
+    """
+    Configure the root logger to write straight to `filename`, replacing any handlers.
+
+    For worker processes: a forked child inherits the parent's queue handler but not
+    its listener thread, so records it queued would never be written.
+
+    Args:
+        filename (str): Path of the log file.
+        level (int): Lowest level to log (default: logging.INFO).
+    """
+    logging.basicConfig(filename=filename, level=level, format=LOG_FORMAT, force=True)
@@ -0,0 +1,114 @@
+import sqlite3
+import logging
+from contextlib import contextmanager
+from typing import List
+
+# Connection tuning for bulk inserts/deletes: WAL journaling, one fsync per
+# checkpoint instead of per commit, in-memory temp tables and a ~200 MB page cache
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-200000;
+"""
+
+# Full-text index over logs.message, kept in sync by triggers. The trigram
+# tokenizer matches arbitrary substrings (case-insensitively), so it can stand
+# in for `message LIKE '%keyword%'` without a full table scan.
+LOGS_FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5(
+        message, content='logs', content_rowid='id', tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS logs_fts_ai AFTER INSERT ON logs BEGIN
+        INSERT INTO logs_fts(rowid, message) VALUES (new.id, new.message);
+    END;
+    CREATE TRIGGER IF NOT EXISTS logs_fts_ad AFTER DELETE ON logs BEGIN
+        INSERT INTO logs_fts(logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+    END;
+    CREATE TRIGGER IF NOT EXISTS logs_fts_au AFTER UPDATE ON logs BEGIN
+        INSERT INTO logs_fts(logs_fts, rowid, message) VALUES ('delete', old.id, old.message);
+        INSERT INTO logs_fts(rowid, message) VALUES (new.id, new.message);
+    END;
+"""
+
+# Trigram queries need at least three characters
+FTS_MIN_KEYWORD_LENGTH = 3
+
+
+def build_keyword_filter(keywords: List[str]):
+    """
+    Build a SQL condition matching logs whose message contains any of the keywords.
+
+    Keywords long enough for the trigram index are combined into a single FTS5
+    MATCH query; shorter ones fall back to LIKE.
+
+    Args:
+        keywords (List[str]): Keywords to search for.
+
+    Returns:
+        tuple: (SQL condition or None if there are no keywords, list of parameters).
+    """
+    conditions = []
+    parameters = []
+
+    fts_keywords = [kw for kw in keywords if len(kw) >= FTS_MIN_KEYWORD_LENGTH]
+    if fts_keywords:
+        conditions.append("id IN (SELECT rowid FROM logs_fts WHERE logs_fts MATCH ?)")
+        parameters.append(" OR ".join('"' + kw.replace('"', '""') + '"' for kw in fts_keywords))
+
+    for kw in keywords:
+        if len(kw) < FTS_MIN_KEYWORD_LENGTH:
+            conditions.append("message LIKE ?")
+            parameters.append(f"%{kw}%")
+
+    if not conditions:
+        return None, []
+    return " OR ".join(conditions), parameters
+
+
+class LogsDatabase:
+    def __init__(self, db_name="logs.db"):
+        """
+        Opens a tuned connection to the SQLite database holding the logs table.
+
+        Args:
+            db_name (str): The name of the SQLite database (default is 'logs.db').
+        """
+        self.db_name = db_name
+        self.conn = sqlite3.connect(self.db_name)
+        self.conn.executescript(SQLITE_PRAGMAS)
+        self.cursor = self.conn.cursor()
+        self._in_transaction = False
+
+    def _create_fts_index(self):
+        """
+        Create the full-text index on log messages, populating it from existing rows
+        the first time it is created. The logs table must already exist.
+        """
+        fts_exists = self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'logs_fts'").fetchone()
+        with self.conn:
+            self.conn.executescript(LOGS_FTS_SCHEMA)
+            if not fts_exists:
+                self.conn.execute("INSERT INTO logs_fts(logs_fts) VALUES ('rebuild')")
+                logging.info("Built full-text index for existing logs.")
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several operations into a single transaction (one commit at the end).
+        """
+        self._in_transaction = True
+        try:
+            with self.conn:
+                yield
+        finally:
+            self._in_transaction = False
+
+    def _commit(self):
+        """Commit unless an enclosing transaction() will commit for us."""
+        if not self._in_transaction:
+            self.conn.commit()
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
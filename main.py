@@ -1,32 +1,64 @@
-import sqlite3
 import os
+import re
+import sys
+import mmap
 import logging
 from datetime import datetime
 from typing import List, Dict
 import pandas as pd
+from logging_setup import setup_queue_logging
+from logs_db import LogsDatabase, build_keyword_filter
 
 # Configure logging for tracking script activities
-logging.basicConfig(
-    filename="main.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
+setup_queue_logging("main.log")
+
+# The structurer lives in its own directory; imported after the logging setup above,
+# which its own setup then leaves in place
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "structure_data"))
+from structurer import save_error_logs
+
+# A log line split on its first two spaces after stripping surrounding whitespace, as bytes:
+# the same fields as `line.strip().split(" ", 2)` on a text-mode line (ending at \r, \n or
+# \r\n). Blanks are the ASCII characters str.strip() removes; non-ASCII whitespace at either
+# end is only caught by the bytes pattern as field content, see _strip_text_only_blanks.
+LOG_LINE_PATTERN = re.compile(
+    rb"(?<![^\r\n])[\t\x0b\x0c\x1c-\x1f ]*"
+    rb"([^\t\x0b\x0c\x1c-\x1f \r\n][^ \r\n]*) ([^ \r\n]*) "
+    rb"([^\r\n]*[^\t\x0b\x0c\x1c-\x1f \r\n])[\t\x0b\x0c\x1c-\x1f ]*(?![^\r\n])"
 )
 
-class LogProcessor:
-    def _init_(self, db_name="logs.db"):
+# Rows loaded per transaction: enough to amortize each commit's fsync, few enough that
+# WAL checkpoints can recycle the write-ahead log instead of letting it grow with the file
+LOAD_COMMIT_ROWS = 100_000
+
+
+def _strip_text_only_blanks(line: bytes):
+    """
+    Split a matched line the way `line.strip().split(" ", 2)` does on the decoded text.
+
+    Used for lines starting or ending with a non-ASCII byte, which may be whitespace
+    (e.g. a no-break space) that str.strip() removes but the bytes pattern keeps.
+
+    Returns:
+        tuple: (timestamp, log_level, message), or None if fewer than three fields remain.
+    """
+    parts = line.decode("utf-8", "replace").strip().split(" ", 2)
+    return tuple(parts) if len(parts) >= 3 else None
+
+
+class LogProcessor(LogsDatabase):
+    def __init__(self, db_name="logs.db"):
         """
         Initializes the LogProcessor with a connection to the SQLite database.
         
         Args:
             db_name (str): The name of the SQLite database (default is 'logs.db').
         """
-        self.db_name = db_name
-        self.conn = sqlite3.connect(self.db_name)
-        self.cursor = self.conn.cursor()
+        super().__init__(db_name)
         self._create_table()
 
     def _create_table(self):
-        """Creates the logs table in the database if it does not already exist."""
+        """Creates the logs table and its full-text index if they do not already exist."""
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS logs (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -37,6 +69,9 @@ class LogProcessor:
         """)
         self.conn.commit()
 
+        # Full-text index for keyword cleaning
+        self._create_fts_index()
+
     def insert_logs(self, logs: List[Dict[str, str]]):
         """
         Inserts logs into the database in batches.
@@ -49,8 +84,8 @@ class LogProcessor:
                 INSERT INTO logs (timestamp, log_level, message)
                 VALUES (:timestamp, :log_level, :message)
             """, logs)
-            self.conn.commit()
-            logging.info(f"Inserted {len(logs)} logs into the database.")
+            self._commit()
+            logging.info("Inserted %s logs into the database.", len(logs))
         else:
             logging.warning("No logs to insert.")
 
@@ -81,14 +116,20 @@ class LogProcessor:
             exclude_keywords (List[str]): List of keywords to exclude from logs.
             exclude_log_levels (List[str]): List of log levels to exclude from logs.
         """
-        self.cursor.execute("""
+        keyword_condition, parameters = build_keyword_filter(exclude_keywords)
+
+        conditions = [keyword_condition] if keyword_condition else []
+        if exclude_log_levels:
+            conditions.append(f"log_level IN ({','.join('?' * len(exclude_log_levels))})")
+            parameters += exclude_log_levels
+        if not conditions:
+            return
+
+        self.cursor.execute(f"""
             DELETE FROM logs
-            WHERE log_level IN ({seq}) OR message LIKE ({keywords})
-        """.format(
-            seq=','.join(['?'] * len(exclude_log_levels)),
-            keywords=" OR ".join([f" ? " for _ in exclude_keywords])
-        ), (*exclude_log_levels, *exclude_keywords))
-        self.conn.commit()
+            WHERE {" OR ".join(conditions)}
+        """, tuple(parameters))
+        self._commit()
         logging.info("Logs cleaned based on the provided keywords and log levels.")
 
     def count_logs(self) -> int:
@@ -96,13 +137,9 @@ class LogProcessor:
         self.cursor.execute("SELECT COUNT(*) FROM logs")
         return self.cursor.fetchone()[0]
 
-    def close(self):
-        """Close the database connection."""
-        self.conn.close()
-
 
 class LogAnalysis:
-    def _init_(self, log_processor: LogProcessor):
+    def __init__(self, log_processor: LogProcessor):
         """
         Initializes LogAnalysis to process and analyze logs.
 
@@ -114,32 +151,48 @@ class LogAnalysis:
     def process_log_file(self, file_path: str, chunk_size: int = 1000):
         """
         Processes a log file in chunks and inserts logs into the database.
+
+        The file is memory-mapped and scanned with a single bytes regex, so lines are never
+        decoded or split one by one in Python; only the captured fields are decoded.
         
         Args:
             file_path (str): The path to the log file to process.
             chunk_size (int): The number of lines to process per chunk (default 1000).
         """
+        if os.path.getsize(file_path) == 0:
+            return  # mmap cannot map an empty file
+
         logs = []
-        with open(file_path, 'r') as file:
-            for line in file:
-                # Example parsing: timestamp, log_level, message
-                parts = line.strip().split(" ", 2)
-                if len(parts) >= 3:
-                    timestamp, log_level, message = parts
-                    logs.append({
-                        "timestamp": timestamp,
-                        "log_level": log_level,
-                        "message": message
-                    })
+        uncommitted = 0
+        # Chunks are committed together, LOAD_COMMIT_ROWS rows at a time
+        with self.processor.transaction(), open(file_path, 'rb') as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # Example parsing: timestamp, log_level, message
+            for match in LOG_LINE_PATTERN.finditer(mapped):
+                timestamp, log_level, message = match.groups()
+                if timestamp[0] >= 0x80 or message[-1] >= 0x80:
+                    fields = _strip_text_only_blanks(match.group())
+                    if fields is None:
+                        continue
+                    timestamp, log_level, message = fields
+                else:
+                    timestamp = timestamp.decode("utf-8", "replace")
+                    log_level = log_level.decode("utf-8", "replace")
+                    message = message.decode("utf-8", "replace")
+                logs.append({"timestamp": timestamp, "log_level": log_level, "message": message})
 
                 # Insert logs into database in chunks
                 if len(logs) >= chunk_size:
                     self.processor.insert_logs(logs)
+                    uncommitted += len(logs)
                     logs = []  # Reset logs after each chunk insertion
+                    if uncommitted >= LOAD_COMMIT_ROWS:
+                        self.processor.conn.commit()
+                        uncommitted = 0
 
-        # Insert any remaining logs in the last batch
-        if logs:
-            self.processor.insert_logs(logs)
+            # Insert any remaining logs in the last batch
+            if logs:
+                self.processor.insert_logs(logs)
 
     def export_to_csv(self, output_file: str):
         """
@@ -151,10 +204,23 @@ class LogAnalysis:
         logs = self.processor.fetch_logs(limit=1000)
         df = pd.DataFrame(logs)
         df.to_csv(output_file, index=False)
-        logging.info(f"Exported logs to {output_file}")
+        logging.info("Exported logs to %s", output_file)
+
+    def export_error_logs(self, output_file: str):
+        """
+        Writes the ERROR entries back out as log lines, for views that show nothing else.
+        
+        Args:
+            output_file (str): The path where the error log will be saved.
+        """
+        df = pd.read_sql_query(
+            "SELECT timestamp, log_level, message FROM logs WHERE log_level = 'ERROR' ORDER BY id",
+            self.processor.conn
+        )
+        save_error_logs(df, output_file)
 
 
-if __name__ == "_main_":
+if __name__ == "__main__":
     # Set up the log processor and analysis objects
     log_processor = LogProcessor(db_name="logs.db")
     log_analysis = LogAnalysis(log_processor=log_processor)
@@ -169,9 +235,11 @@ if __name__ == "_main_":
 
         # Export processed logs to CSV
         log_analysis.export_to_csv("processed_logs.csv")
+        # Read by the web app's /errors page instead of the full log
+        log_analysis.export_error_logs("errors.log")
 
     except Exception as e:
-        logging.error(f"Error during log processing: {e}")
+        logging.error("Error during log processing: %s", e)
 
     finally:
         log_processor.close()
\ No newline at end of file
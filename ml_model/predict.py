@@ -1,3 +1,5 @@
+import os
+from itertools import islice
 import pandas as pd
 from joblib import load
 
@@ -8,6 +10,10 @@ vectorizer_path = "./ml_model/vectorizer.pkl"
 model = load(model_path)
 vectorizer = load(vectorizer_path)
 
+# Let ensemble models (e.g. random forests) predict on all cores
+if hasattr(model, "n_jobs"):
+    model.n_jobs = os.cpu_count()
+
 def predict_category(log_messages):
     """
     Predict categories for a list of log messages.
@@ -19,6 +25,20 @@ def predict_category(log_messages):
     predictions = model.predict(log_features)
     return predictions
 
+def predict_stream(log_messages, batch_size=4096):
+    """
+    Predict categories for an iterable of log messages, one batch at a time.
+
+    Only `batch_size` messages are vectorized at once, so arbitrarily long
+    streams (e.g. a file iterator) can be classified in bounded memory.
+    """
+    log_messages = iter(log_messages)
+    while True:
+        batch = list(islice(log_messages, batch_size))
+        if not batch:
+            break
+        yield from model.predict(vectorizer.transform(batch))
+
 if __name__ == "__main__":
     # Example logs
     example_logs = [
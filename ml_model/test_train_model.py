@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+import train_model
+
+
+class TestTrainModel(unittest.TestCase):
+
+    def setUp(self):
+        """Run each test in a temporary directory holding a small labelled dataset."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.tmpdir.name)
+        self.addCleanup(os.chdir, cwd)
+        os.mkdir("ml_model")
+
+        messages = ["disk failure on node", "link down on port", "user logged in"]
+        labels = ["error", "warning", "info"]
+        pd.DataFrame({
+            "log_message": [f"{messages[i % 3]} {i}" for i in range(21)],
+            "label": [labels[i % 3] for i in range(21)],
+        }).to_csv("processed_logs.csv", index=False)
+
+    def test_train_model_with_single_row_last_chunk(self):
+        """Test that a final one-row chunk neither fails nor changes the held-out rows."""
+        with patch.object(train_model, "CHUNK_SIZE", 10):
+            train_model.train_model()
+            held_out_by_10 = pd.concat([chunk[mask] for chunk, mask in train_model.read_chunks()])
+
+        self.assertTrue(os.path.exists("ml_model/model.pkl"))
+        self.assertTrue(os.path.exists("ml_model/vectorizer.pkl"))
+
+        with patch.object(train_model, "CHUNK_SIZE", 7):
+            held_out_by_7 = pd.concat([chunk[mask] for chunk, mask in train_model.read_chunks()])
+        pd.testing.assert_frame_equal(held_out_by_10, held_out_by_7)
+
+
+if __name__ == "__main__":
+    unittest.main()
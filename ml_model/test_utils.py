@@ -0,0 +1,38 @@
+import re
+import unittest
+
+from utils import preprocess_log, preprocess_batch
+
+
+def regex_preprocess_log(log):
+    """
+    The original regex-only preprocessing, kept as the reference behaviour.
+    """
+    return re.sub(r'[^\w\s]|\d', '', log.lower())
+
+
+class TestPreprocess(unittest.TestCase):
+
+    def setUp(self):
+        self.logs = [
+            "2024-12-19 12:00:00 ERROR: Link down on eth0 (code=42)!",
+            "\x1b[31mERROR\x1b[0m: disk\x00full\x7f at /var/log",
+            "WARNING\tretry\x1c\x1dnext_hop=10.0.0.1\r\n",
+            "Café naïve — déjà vu № 7",
+            "",
+        ]
+
+    def test_preprocess_log_matches_regex(self):
+        """Test that every ASCII character is handled exactly as the regex rule does."""
+        ascii_chars = "".join(map(chr, range(128)))
+        self.assertEqual(preprocess_log(ascii_chars), regex_preprocess_log(ascii_chars))
+        for log in self.logs:
+            self.assertEqual(preprocess_log(log), regex_preprocess_log(log), repr(log))
+
+    def test_preprocess_batch_matches_preprocess_log(self):
+        """Test that the vectorized version gives the same result as one log at a time."""
+        self.assertEqual(preprocess_batch(self.logs).tolist(), [regex_preprocess_log(log) for log in self.logs])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,40 +1,65 @@
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
 from sklearn.metrics import accuracy_score
 from joblib import dump
 
 # Load data from processed logs
 data_path = "./processed_logs.csv"
 
-def train_model():
-    # Load dataset
-    data = pd.read_csv(data_path)
+# Rows read and trained on at a time
+CHUNK_SIZE = 100_000
+
+# Fraction of rows held out for evaluation. Rows are assigned by a seeded generator, not
+# split per chunk, so every chunk size works and the same rows are held out on every pass.
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+
+def read_chunks():
+    """
+    Read the dataset in chunks, each with a mask of the rows held out for evaluation.
+    """
+    rng = np.random.default_rng(RANDOM_STATE)
+    for chunk in pd.read_csv(data_path, usecols=['log_message', 'label'], chunksize=CHUNK_SIZE):
+        yield chunk, rng.random(len(chunk)) < TEST_SIZE
 
+def train_model():
     # Assume the dataset contains 'log_message' and 'label' columns
-    X = data['log_message']
-    y = data['label']  # Labels: e.g., "error", "warning", "info"
+    # Labels: e.g., "error", "warning", "info". partial_fit needs them all up front.
+    classes = np.unique(pd.read_csv(data_path, usecols=['label'])['label'])
+
+    # Convert text data to numeric with a stateless hashing vectorizer (no vocabulary to fit)
+    vectorizer = HashingVectorizer(n_features=2**18, alternate_sign=False, ngram_range=(1, 2))
+
+    # Linear model trained incrementally, one chunk of the dataset at a time
+    model = SGDClassifier(loss="log_loss", random_state=42)
 
-    # Convert text data to numeric (simple example with TF-IDF)
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    vectorizer = TfidfVectorizer(max_features=1000)
-    X_tfidf = vectorizer.fit_transform(X)
+    for chunk, held_out in read_chunks():
+        train = chunk[~held_out]
+        if train.empty:
+            continue
 
-    # Split data into training and test sets
-    X_train, X_test, y_train, y_test = train_test_split(X_tfidf, y, test_size=0.2, random_state=42)
+        # Train model
+        model.partial_fit(vectorizer.transform(train['log_message']), train['label'], classes=classes)
 
-    # Train model
-    model = RandomForestClassifier(n_estimators=100, random_state=42)
-    model.fit(X_train, y_train)
+    # Evaluate the final model on the held-out rows
+    y_test_all, y_pred_all = [], []
+    for chunk, held_out in read_chunks():
+        test = chunk[held_out]
+        if not test.empty:
+            y_test_all.extend(test['label'])
+            y_pred_all.extend(model.predict(vectorizer.transform(test['log_message'])))
 
-    # Evaluate accuracy
-    y_pred = model.predict(X_test)
-    accuracy = accuracy_score(y_test, y_pred)
-    print(f"Model Training Complete. Accuracy: {accuracy * 100:.2f}%")
+    if y_test_all:
+        accuracy = accuracy_score(y_test_all, y_pred_all)
+        print(f"Model Training Complete. Accuracy: {accuracy * 100:.2f}%")
+    else:
+        print("Model Training Complete. Too few rows to hold any out for evaluation.")
 
     # Save the model and vectorizer
-    dump(model, "./ml_model/model.pkl")
-    dump(vectorizer, "./ml_model/vectorizer.pkl")
+    dump(model, "./ml_model/model.pkl", compress=3)
+    dump(vectorizer, "./ml_model/vectorizer.pkl", compress=3)
 
 if __name__ == "__main__":
     train_model()
@@ -1,10 +1,26 @@
 import re
+import pandas as pd
+
+# Punctuation, digits and control characters: anything that is neither a word character nor whitespace
+_STRIP_RE = re.compile(r'[^\w\s]|\d')
+# The same rule as a translate table over ASCII; the regex is only needed for the rare non-ASCII logs
+_STRIP_TABLE = str.maketrans("", "", "".join(c for c in map(chr, range(128)) if _STRIP_RE.match(c)))
 
 def preprocess_log(log):
     """
     Simple text preprocessing for log messages.
     """
-    log = log.lower()
-    log = re.sub(r'[^\w\s]', '', log)  # Remove punctuation
-    log = re.sub(r'\d+', '', log)      # Remove numbers
+    log = log.lower().translate(_STRIP_TABLE)  # Remove punctuation and numbers
+    if not log.isascii():
+        log = _STRIP_RE.sub('', log)  # Unicode punctuation and digits
     return log
+
+def preprocess_batch(logs):
+    """
+    Vectorized `preprocess_log` over a batch of log messages.
+    """
+    logs = pd.Series(logs, dtype="object").str.lower().str.translate(_STRIP_TABLE)
+    non_ascii = ~logs.map(str.isascii)
+    if non_ascii.any():
+        logs[non_ascii] = logs[non_ascii].str.replace(_STRIP_RE, '', regex=True)
+    return logs
@@ -1,85 +1,376 @@
+import os
+import json
+import asyncio
+import tempfile
+import threading
 import unittest
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, AsyncMock
 
+import numpy as np
 import openai
-from analyzer import analyze_log_entry
+import analyzer
+from analyzer import analyze_log_entry, analyze_log_entries
+
+
+def chat_response(text, confidence=0.9):
+    """
+    Build a minimal stand-in for an OpenAI chat completion response in the RootCause format.
+    """
+    content = json.dumps({"root_cause": text, "confidence": confidence})
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+async def fake_embeddings(model, input, dimensions):
+    """
+    Stand-in for the embeddings endpoint: a deterministic random vector per text, so
+    distinct texts are far apart and identical texts match exactly.
+    """
+    data = []
+    for text in input:
+        seed = int.from_bytes(text.encode("utf-8")[:8].ljust(8, b"\0"), "little") ^ len(text)
+        data.append(SimpleNamespace(embedding=np.random.default_rng(seed).standard_normal(dimensions).tolist()))
+    return SimpleNamespace(data=data)
+
+
+def rate_limit_error():
+    """
+    Build an OpenAI rate-limit error without a real HTTP response.
+    """
+    return openai.RateLimitError("Rate limit reached", response=MagicMock(status_code=429), body=None)
+
 
 class TestAnalyzer(unittest.TestCase):
-    
-    @patch('openai.Completion.create')
-    def test_analyze_log_entry_success(self, mock_create):
+
+    def setUp(self):
+        """
+        Point the analysis cache at a throwaway database and replace the OpenAI client
+        with a mock for each test.
+        """
+        fd, self.cache_db = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        cache_patch = patch.object(analyzer, "CACHE_DB", self.cache_db)
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+        self.addCleanup(os.remove, self.cache_db)
+
+        self.mock_client = MagicMock()
+        self.mock_client.chat.completions.create = AsyncMock()
+        self.mock_client.embeddings.create = AsyncMock(side_effect=fake_embeddings)
+        self.mock_client.close = AsyncMock()
+        self.mock_create = self.mock_client.chat.completions.create
+        client_patch = patch.object(analyzer, "AsyncOpenAI", return_value=self.mock_client)
+        self.mock_client_cls = client_patch.start()
+        self.addCleanup(client_patch.stop)
+
+    def test_analyze_log_entry_success(self):
         """
         Test successful root cause analysis of a log entry.
         """
         # Mock the OpenAI response
-        mock_response = MagicMock()
-        mock_response['choices'][0]['text'] = "The issue is caused by a network link failure between Node A and Node B."
-        mock_create.return_value = mock_response
-        
+        self.mock_create.return_value = chat_response("The issue is caused by a network link failure between Node A and Node B.")
+
         log_entry = "ERROR: Packet loss detected between Node A and Node B."
-        
+
         # Call the function
         result = analyze_log_entry(log_entry)
-        
+
         # Assertions
         self.assertEqual(result, "The issue is caused by a network link failure between Node A and Node B.")
-        mock_create.assert_called_once_with(
-            engine="gpt-4",
-            prompt=("The following is a network log entry. Analyze the log entry "
-                    "to identify the root cause of the issue:\n\nERROR: Packet loss detected between Node A and Node B.\n\n"
-                    "Provide a concise and clear explanation of the root cause."),
-            max_tokens=150,
-            temperature=0.3,
-            top_p=1,
-            n=1,
-            stop=None
+        self.mock_create.assert_awaited_once_with(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": analyzer.ROOT_CAUSE_PREAMBLE},
+                {"role": "user", "content": "ERROR: Packet loss detected between Node A and Node B."}
+            ],
+            max_tokens=80,
+            temperature=0,
+            seed=42,
+            response_format=analyzer.ROOT_CAUSE_RESPONSE_FORMAT,
+            extra_body={"prompt_cache_key": "root_cause_v1"}
         )
+        self.mock_client.close.assert_awaited_once()
+        # Requests go through one shared, explicitly configured connection pool
+        self.assertIsNotNone(self.mock_client_cls.call_args.kwargs.get("http_client"))
 
-    @patch('openai.Completion.create')
-    def test_analyze_log_entry_invalid(self, mock_create):
+    def test_analyze_log_entry_invalid(self):
         """
         Test when the log entry is invalid (empty string or None).
         """
         log_entry = ""
         result = analyze_log_entry(log_entry)
         self.assertEqual(result, "Error: Invalid log entry.")
-        
+
         log_entry = None
         result = analyze_log_entry(log_entry)
         self.assertEqual(result, "Error: Invalid log entry.")
-        
+
         # Ensure OpenAI API is not called when the log entry is invalid
-        mock_create.assert_not_called()
+        self.mock_create.assert_not_called()
 
-    @patch('openai.Completion.create')
-    def test_analyze_log_entry_openai_error(self, mock_create):
+    def test_analyze_log_entry_openai_error(self):
         """
         Test OpenAI API error handling.
         """
         # Simulate an OpenAI API error
-        mock_create.side_effect = openai.error.OpenAIError("API request failed")
-        
+        self.mock_create.side_effect = openai.OpenAIError("API request failed")
+
         log_entry = "ERROR: Authentication failed for user admin on Node C."
         result = analyze_log_entry(log_entry)
-        
+
         # Assert that the error handling works as expected
         self.assertEqual(result, "Error: Failed to analyze due to an OpenAI API error.")
-        mock_create.assert_called_once()
+        self.mock_create.assert_called_once()
+
+    @patch.object(analyzer.asyncio, "sleep", new_callable=AsyncMock)
+    def test_analyze_log_entry_retries_on_rate_limit(self, mock_sleep):
+        """
+        Test that rate-limit errors are retried with backoff.
+        """
+        self.mock_create.side_effect = [
+            rate_limit_error(),
+            chat_response(" Link flapping on Node B. "),
+        ]
+
+        result = analyze_log_entry("ERROR: Node B is unreachable.")
+
+        self.assertEqual(result, "Link flapping on Node B.")
+        self.assertEqual(self.mock_create.call_count, 2)
+        mock_sleep.assert_awaited_once()
+
+    def test_analyze_log_entry_uses_cache(self):
+        """
+        Test that repeating an analysis is served from the cache.
+        """
+        self.mock_create.return_value = chat_response("Interface eth1 went down.")
+
+        first = analyze_log_entry("ERROR: Interface eth1 down.")
+        second = analyze_log_entry("ERROR: Interface eth1 down.")
+
+        self.assertEqual(first, "Interface eth1 went down.")
+        self.assertEqual(second, first)
+        self.mock_create.assert_called_once()
+
+    def test_analyze_log_entries_reads_cache_off_event_loop(self):
+        """
+        Test that the analysis and semantic caches are read and written outside the event
+        loop thread, and that a repeated entry is analyzed once.
+        """
+        self.mock_create.side_effect = lambda **kwargs: chat_response(kwargs["messages"][-1]["content"].upper())
+        entries = ["ERROR: Node A down.", "WARNING: Link B flapping.", "ERROR: Node A down."]
+        threads = []
+
+        def record_thread(function):
+            def wrapper(*args):
+                threads.append(threading.get_ident())
+                return function(*args)
+            return wrapper
+
+        with patch.object(analyzer, "_semantic_cache", None), \
+                patch.object(analyzer, "_get_cached_results", record_thread(analyzer._get_cached_results)), \
+                patch.object(analyzer, "_store_cached_results", record_thread(analyzer._store_cached_results)), \
+                patch.object(analyzer, "_get_semantic_cache", record_thread(analyzer._get_semantic_cache)), \
+                patch.object(analyzer.SemanticCache, "add", record_thread(analyzer.SemanticCache.add)):
+            first = asyncio.run(analyze_log_entries(entries))
+            second = asyncio.run(analyze_log_entries(entries))
+
+        self.assertEqual(first, ["ERROR: NODE A DOWN.", "WARNING: LINK B FLAPPING.", "ERROR: NODE A DOWN."])
+        self.assertEqual(second, first)
+        self.assertEqual(self.mock_create.call_count, 2, "The repeated entry should be analyzed once.")
+        # First call: both caches read and written; second call: served by the analysis cache
+        self.assertEqual(len(threads), 6)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_analyze_log_entry_uses_semantic_cache(self):
+        """
+        Test that an entry similar enough to an analyzed one reuses its root cause.
+        """
+        self.mock_create.return_value = chat_response("Interface eth1 went down.")
+        vector = SimpleNamespace(embedding=[1.0] + [0.0] * (analyzer.EMBEDDING_DIMENSIONS - 1))
+        self.mock_client.embeddings.create.side_effect = None
+        self.mock_client.embeddings.create.return_value = SimpleNamespace(data=[vector])
+
+        with patch.object(analyzer, "_semantic_cache", None):
+            first = analyze_log_entry("ERROR: Interface eth1 down at 10:00.")
+            second = analyze_log_entry("ERROR: Interface eth1 down at 10:05.")
+
+        self.assertEqual(first, "Interface eth1 went down.")
+        self.assertEqual(second, first)
+        self.mock_create.assert_called_once()
+
+    def test_semantic_cache_matches_only_current_settings(self):
+        """
+        Test that root causes found with other model settings are not reused, but are kept.
+        """
+        self.mock_create.side_effect = [chat_response("Interface eth1 went down."), chat_response("Cable fault on eth1.")]
+        vector = SimpleNamespace(embedding=[1.0] + [0.0] * (analyzer.EMBEDDING_DIMENSIONS - 1))
+        self.mock_client.embeddings.create.side_effect = None
+        self.mock_client.embeddings.create.return_value = SimpleNamespace(data=[vector])
+
+        with patch.object(analyzer, "_semantic_cache", None):
+            first = analyze_log_entry("ERROR: Interface eth1 down at 10:00.")
+            with patch.object(analyzer, "MODEL_ENGINE", "gpt-4o"):
+                other_model = analyze_log_entry("ERROR: Interface eth1 down at 10:05.")
+            again = analyze_log_entry("ERROR: Interface eth1 down at 10:10.")
+
+        self.assertEqual(first, "Interface eth1 went down.")
+        self.assertEqual(other_model, "Cable fault on eth1.")
+        self.assertEqual(again, first, "Rows for the current settings should still match.")
+        self.assertEqual(self.mock_create.call_count, 2)
 
-    @patch('openai.Completion.create')
-    def test_analyze_log_entry_unexpected_error(self, mock_create):
+    def test_analyze_log_entries_embeds_only_cache_misses(self):
+        """
+        Test that entries in the exact cache and repeats are not embedded, and analyzed entries are stored once.
+        """
+        self.mock_create.side_effect = lambda **kwargs: chat_response(kwargs["messages"][-1]["content"].upper())
+
+        with patch.object(analyzer, "_semantic_cache", None):
+            asyncio.run(analyze_log_entries(["ERROR: Node A down.", "ERROR: Node A down."]))
+            asyncio.run(analyze_log_entries(["ERROR: Node A down.", "WARNING: Link B flapping."]))
+            semantic_cache = analyzer._semantic_cache
+
+        embedded = [text for call in self.mock_client.embeddings.create.await_args_list for text in call.kwargs["input"]]
+        self.assertEqual(embedded, ["ERROR: Node A down.", "WARNING: Link B flapping."])
+        self.assertEqual(semantic_cache.root_causes, ["ERROR: NODE A DOWN.", "WARNING: LINK B FLAPPING."])
+        self.assertEqual(semantic_cache.embeddings.shape, (2, analyzer.EMBEDDING_DIMENSIONS))
+
+    def test_analyze_log_entries_concurrently(self):
+        """
+        Test that a batch of entries is analyzed with results in input order.
+        """
+        async def fake_create(**kwargs):
+            content = kwargs["messages"][-1]["content"]
+            await asyncio.sleep(0.01 if "Node A" in content else 0)
+            return chat_response("A" if "Node A" in content else "B")
+
+        self.mock_create.side_effect = fake_create
+
+        results = asyncio.run(analyze_log_entries(["ERROR: Node A down.", "ERROR: Node B down.", ""]))
+
+        self.assertEqual(results, ["A", "B", "Error: Invalid log entry."])
+        self.assertEqual(self.mock_create.await_count, 2)
+
+    def test_rate_limiter_waits_for_capacity(self):
+        """
+        Test that the rate limiter delays requests once its buckets are drained.
+        """
+        clock = [0.0]
+
+        async def fake_sleep(seconds):
+            clock[0] += seconds
+
+        with patch.object(analyzer.time, "monotonic", lambda: clock[0]), \
+                patch.object(analyzer.asyncio, "sleep", side_effect=fake_sleep):
+            limiter = analyzer.RateLimiter(max_requests_per_minute=60, max_tokens_per_minute=600)
+
+            async def run():
+                await limiter.acquire(300)
+                await limiter.acquire(300)
+                start = clock[0]
+                await limiter.acquire(300)  # token bucket is empty: 300 tokens refill in 30s
+                return clock[0] - start
+
+            waited = asyncio.run(run())
+
+        self.assertAlmostEqual(waited, 30.0)
+
+    def test_analyze_log_entry_malformed_response(self):
+        """
+        Test that a response not matching the RootCause schema is reported as a failure.
+        """
+        self.mock_create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="Link down"))]
+        )
+
+        result = analyze_log_entry("ERROR: Node B is unreachable.")
+
+        self.assertEqual(result, "Error: Unexpected failure during analysis.")
+
+    def test_analyze_log_entry_unexpected_error(self):
         """
         Test handling of unexpected errors during analysis.
         """
         # Simulate a generic exception
-        mock_create.side_effect = Exception("Unexpected error")
-        
+        self.mock_create.side_effect = Exception("Unexpected error")
+
         log_entry = "ERROR: Node B is unreachable."
         result = analyze_log_entry(log_entry)
-        
+
         # Assert that the unexpected error is handled
         self.assertEqual(result, "Error: Unexpected failure during analysis.")
-        mock_create.assert_called_once()
+        self.mock_create.assert_called_once()
+
+    @patch.object(analyzer, "OpenAI")
+    def test_submit_and_poll_batch(self, mock_openai_cls):
+        """
+        Test that a batch job is submitted as JSONL and its results are returned in input order.
+        """
+        sync_client = mock_openai_cls.return_value
+        sync_client.files.create.return_value = SimpleNamespace(id="file-in")
+        sync_client.batches.create.return_value = SimpleNamespace(id="batch-1")
+
+        batch_id = analyzer.submit_batch(["ERROR: Node A down.", "", "ERROR: Node B down."])
+
+        self.assertEqual(batch_id, "batch-1")
+        _, content = sync_client.files.create.call_args.kwargs["file"]
+        requests = [json.loads(line) for line in content.decode("utf-8").splitlines()]
+        self.assertEqual([r["custom_id"] for r in requests], ["entry-0", "entry-2"])
+        self.assertEqual(requests[0]["body"]["model"], "gpt-4o-mini")
+        self.assertEqual(sync_client.batches.create.call_args.kwargs["completion_window"], "24h")
+
+        def output_line(custom_id, status_code, text=None):
+            body = {"choices": [{"message": {"content": json.dumps({"root_cause": text, "confidence": 0.9})}}]}
+            return json.dumps({"custom_id": custom_id, "response": {"status_code": status_code, "body": body}})
+
+        sync_client.batches.retrieve.side_effect = [
+            SimpleNamespace(status="in_progress"),
+            SimpleNamespace(status="completed", metadata={"entry_count": "3"}, input_file_id="file-in",
+                            output_file_id="file-out", error_file_id=None),
+        ]
+        files = {
+            "file-in": content.decode("utf-8"),
+            "file-out": output_line("entry-2", 200, "B") + "\n" + output_line("entry-0", 429),
+        }
+        sync_client.files.content.side_effect = lambda file_id: SimpleNamespace(text=files[file_id])
+
+        with patch.object(analyzer.time, "sleep") as mock_sleep:
+            results = analyzer.poll_batch("batch-1")
+
+        mock_sleep.assert_called_once()
+        self.assertEqual(results, [
+            "Error: Failed to analyze due to an OpenAI API error.",
+            "Error: Invalid log entry.",
+            "B",
+        ])
+
+    @patch.object(analyzer, "OpenAI")
+    def test_poll_batch_failed_or_expired(self, mock_openai_cls):
+        """
+        Test that sent entries without a result are reported as API failures when a batch
+        fails or expires, even without metadata.
+        """
+        sync_client = mock_openai_cls.return_value
+        input_lines = "\n".join(json.dumps({"custom_id": f"entry-{i}"}) for i in (0, 2))
+        partial_output = json.dumps({"custom_id": "entry-2", "response": {"status_code": 200, "body": {
+            "choices": [{"message": {"content": json.dumps({"root_cause": "B", "confidence": 0.9})}}]
+        }}})
+        files = {"file-in": input_lines, "file-out": partial_output}
+        sync_client.files.content.side_effect = lambda file_id: SimpleNamespace(text=files[file_id])
+        api_error = "Error: Failed to analyze due to an OpenAI API error."
+
+        sync_client.batches.retrieve.return_value = SimpleNamespace(
+            status="failed", metadata=None, input_file_id="file-in", errors="invalid input",
+            output_file_id=None, error_file_id=None
+        )
+        self.assertEqual(analyzer.poll_batch("batch-1"), [api_error, "Error: Invalid log entry.", api_error])
+
+        sync_client.batches.retrieve.return_value = SimpleNamespace(
+            status="expired", metadata={"entry_count": "4"}, input_file_id="file-in",
+            output_file_id="file-out", error_file_id=None
+        )
+        self.assertEqual(analyzer.poll_batch("batch-1"), [
+            api_error, "Error: Invalid log entry.", "B", "Error: Invalid log entry."
+        ])
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,101 +1,107 @@
+import atexit
 import sqlite3
 import logging
+from contextlib import suppress
 from typing import List, Dict
 import os
+import sys
+
+# The shared logging setup lives at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from logging_setup import setup_queue_logging
+
+try:
+    from .history_store import HistoryStore
+except ImportError:
+    # Imported from inside the package directory
+    from history_store import HistoryStore
 
 # Set up logging
-logging.basicConfig(
-    filename="history_manager.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+setup_queue_logging("history_manager.log")
 
 # Define the database file path
 DB_FILE = "log_analysis_history.db"
 
-def create_db_connection():
+# Pooled connections and batched writes for DB_FILE. Unlike db_setup, failed stores
+# are logged (by the store) and not raised to the caller.
+_store = HistoryStore(DB_FILE)
+create_db_connection = _store.connect
+reader_conn = _store.reader_conn
+writer_conn = _store.writer_conn
+close_connections = _store.close
+
+def store_analysis_result(log_entry: str, root_cause: str):
     """
-    Create a connection to the SQLite database. If the database file doesn't exist,
-    it will be created.
+    Queue the result of the log analysis for the next batched commit.
+    
+    Args:
+        log_entry (str): The original log entry.
+        root_cause (str): The root cause identified by GPT.
+    """
+    # A full batch is committed right away, which can fail like any other store
+    with suppress(Exception):
+        _store.store_analysis_result(log_entry, root_cause)
+
+def flush():
     """
-    conn = sqlite3.connect(DB_FILE)
-    logging.info(f"Connected to the database {DB_FILE}")
-    return conn
+    Commit all queued analysis results in a single transaction.
+    """
+    with suppress(Exception):
+        _store.flush()
+
+atexit.register(close_connections)
+# Runs before close_connections() (atexit handlers run in reverse order)
+atexit.register(flush)
 
 def create_table():
     """
     Create the table for storing log analysis results if it doesn't already exist.
     """
-    conn = create_db_connection()
-    cursor = conn.cursor()
+    with writer_conn() as conn:
+        cursor = conn.cursor()
     
-    # SQL query to create the table
-    create_table_query = """
-    CREATE TABLE IF NOT EXISTS LogAnalysisHistory (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        log_entry TEXT NOT NULL,
-        root_cause TEXT NOT NULL,
-        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-    );
-    """
+        # SQL query to create the table
+        create_table_query = """
+        CREATE TABLE IF NOT EXISTS LogAnalysisHistory (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            log_entry TEXT NOT NULL,
+            root_cause TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        """
     
-    cursor.execute(create_table_query)
-    conn.commit()
+        cursor.execute(create_table_query)
     logging.info("Table 'LogAnalysisHistory' is created or already exists.")
-    conn.close()
 
-def store_analysis_result(log_entry: str, root_cause: str):
+def store_analysis_result_sync(log_entry: str, root_cause: str):
     """
-    Store the result of the log analysis into the database.
+    Store the result of the log analysis into the database, committing before returning.
     
     Args:
         log_entry (str): The original log entry.
         root_cause (str): The root cause identified by GPT.
     """
-    try:
-        conn = create_db_connection()
-        cursor = conn.cursor()
-        
-        # SQL query to insert the analysis result into the table
-        insert_query = """
-        INSERT INTO LogAnalysisHistory (log_entry, root_cause)
-        VALUES (?, ?);
-        """
-        
-        cursor.execute(insert_query, (log_entry, root_cause))
-        conn.commit()
-        logging.info(f"Successfully stored log analysis for: {log_entry[:30]}...")
-        conn.close()
-    except Exception as e:
-        logging.error(f"Error storing log analysis: {e}")
+    with suppress(Exception):
+        _store.store_analysis_result_sync(log_entry, root_cause)
 
-def fetch_all_history() -> List[Dict[str, str]]:
+def fetch_all_history() -> List[sqlite3.Row]:
     """
     Fetch all the analysis results from the history table.
     
     Returns:
-        List[Dict[str, str]]: A list of dictionaries containing the logs and their corresponding root causes.
+        List[sqlite3.Row]: Rows with id, log_entry, root_cause and timestamp, addressable by
+        column name (e.g. row["root_cause"]); wrap one in dict() if a plain dictionary is needed.
     """
-    conn = create_db_connection()
-    cursor = conn.cursor()
-    
-    fetch_query = "SELECT id, log_entry, root_cause, timestamp FROM LogAnalysisHistory;"
-    cursor.execute(fetch_query)
+    with reader_conn() as conn:
+        cursor = conn.cursor()
     
-    rows = cursor.fetchall()
-    conn.close()
+        fetch_query = "SELECT id, log_entry, root_cause, timestamp FROM LogAnalysisHistory;"
+        cursor.execute(fetch_query)
     
-    history = []
-    for row in rows:
-        history.append({
-            "id": row[0],
-            "log_entry": row[1],
-            "root_cause": row[2],
-            "timestamp": row[3]
-        })
+        rows = cursor.fetchall()
     
-    logging.info(f"Fetched {len(history)} historical entries.")
-    return history
+    logging.info("Fetched %s historical entries.", len(rows))
+    return rows
 
 def fetch_history_by_id(log_id: int) -> Dict[str, str]:
     """
@@ -107,23 +113,18 @@ def fetch_history_by_id(log_id: int) -> Dict[str, str]:
     Returns:
         Dict[str, str]: A dictionary containing the log and its root cause.
     """
-    conn = create_db_connection()
-    cursor = conn.cursor()
+    with reader_conn() as conn:
+        cursor = conn.cursor()
     
-    fetch_query = "SELECT log_entry, root_cause, timestamp FROM LogAnalysisHistory WHERE id = ?;"
-    cursor.execute(fetch_query, (log_id,))
+        fetch_query = "SELECT log_entry, root_cause, timestamp FROM LogAnalysisHistory WHERE id = ?;"
+        cursor.execute(fetch_query, (log_id,))
     
-    row = cursor.fetchone()
-    conn.close()
+        row = cursor.fetchone()
     
     if row:
-        return {
-            "log_entry": row[0],
-            "root_cause": row[1],
-            "timestamp": row[2]
-        }
+        return dict(row)
     else:
-        logging.warning(f"No entry found for ID: {log_id}")
+        logging.warning("No entry found for ID: %s", log_id)
         return {}
 
 def delete_old_history(older_than_days: int = 30):
@@ -133,18 +134,16 @@ def delete_old_history(older_than_days: int = 30):
     Args:
         older_than_days (int): The age in days after which the log entries should be deleted.
     """
-    conn = create_db_connection()
-    cursor = conn.cursor()
+    with writer_conn() as conn:
+        cursor = conn.cursor()
     
-    delete_query = """
-    DELETE FROM LogAnalysisHistory 
-    WHERE timestamp < DATE('now', ?);
-    """
+        delete_query = """
+        DELETE FROM LogAnalysisHistory 
+        WHERE timestamp < DATE('now', ?);
+        """
     
-    cursor.execute(delete_query, (f'-{older_than_days} days',))
-    conn.commit()
-    logging.info(f"Deleted entries older than {older_than_days} days.")
-    conn.close()
+        cursor.execute(delete_query, (f'-{older_than_days} days',))
+    logging.info("Deleted entries older than %s days.", older_than_days)
 
 def store_batch_analysis_results(batch_results: List[Dict[str, str]]):
     """
@@ -153,18 +152,5 @@ def store_batch_analysis_results(batch_results: List[Dict[str, str]]):
     Args:
         batch_results (List[Dict[str, str]]): A list of dictionaries containing logs and their root causes.
     """
-    try:
-        conn = create_db_connection()
-        cursor = conn.cursor()
-        
-        insert_query = """
-        INSERT INTO LogAnalysisHistory (log_entry, root_cause)
-        VALUES (?, ?);
-        """
-        
-        cursor.executemany(insert_query, [(result['log'], result['root_cause']) for result in batch_results])
-        conn.commit()
-        logging.info(f"Successfully stored {len(batch_results)} batch log analyses.")
-        conn.close()
-    except Exception as e:
-        logging.error(f"Error storing batch log analysis: {e}")
+    with suppress(Exception):
+        _store.store_batch_analysis_results(batch_results)
@@ -0,0 +1,219 @@
+import os
+import queue
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager, suppress
+from typing import List, Dict
+
+# Connection tuning: WAL journaling lets readers run alongside a writer and needs one
+# fsync per checkpoint instead of two per commit. WAL mode keeps "-wal" and "-shm"
+# files next to the database while it is open.
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA busy_timeout=5000;
+    PRAGMA cache_size=-20000;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA foreign_keys=ON;
+"""
+
+# WAL lets any number of readers run alongside a single writer, so reads draw from a
+# pool of up to READER_POOL_SIZE connections while writes serialize on one writer
+READER_POOL_SIZE = os.cpu_count() or 4
+
+# Single-row stores are buffered and committed together, once COMMIT_BATCH_SIZE
+# rows are pending or COMMIT_INTERVAL_SECONDS after the first one, whichever is
+# sooner. This trades a short window of durability for one fsync per batch.
+COMMIT_BATCH_SIZE = 500
+COMMIT_INTERVAL_SECONDS = 0.1
+
+INSERT_ANALYSIS_QUERY = """
+INSERT INTO LogAnalysisHistory (log_entry, root_cause)
+VALUES (?, ?);
+"""
+
+
+class HistoryStore:
+    """
+    Pooled connections to one log analysis history database, and the writes to its
+    LogAnalysisHistory table.
+    """
+
+    def __init__(self, db_file: str):
+        """
+        Args:
+            db_file (str): Path of the SQLite database. It is created on first connect.
+        """
+        self.db_file = db_file
+        self._readers = queue.Queue()
+        self._readers_created = 0
+        self._readers_lock = threading.Lock()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Open a tuned connection to the database.
+        """
+        try:
+            # Pooled connections are shared between threads (one at a time)
+            conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            conn.executescript(SQLITE_PRAGMAS)
+            # Rows support both row[0] and row['column'] access without building a dict per row
+            conn.row_factory = sqlite3.Row
+            logging.info("Connected to database %s", self.db_file)
+            return conn
+        except sqlite3.Error as e:
+            logging.error("Error connecting to database: %s", e)
+            raise
+
+    @contextmanager
+    def reader_conn(self):
+        """
+        Borrow a read-only connection from the reader pool, opening one if the pool
+        is not yet full.
+        """
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._readers_lock:
+                can_open = self._readers_created < READER_POOL_SIZE
+                if can_open:
+                    self._readers_created += 1
+            conn = self.connect() if can_open else self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def writer_conn(self):
+        """
+        Hold the single writer connection for one transaction. The transaction starts
+        with BEGIN IMMEDIATE, so the write lock is taken up front instead of failing
+        with SQLITE_BUSY halfway through; it commits on success and rolls back on error.
+        """
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self.connect()
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+            except BaseException:
+                self._writer.rollback()
+                raise
+            self._writer.commit()
+
+    def close(self):
+        """
+        Close every pooled connection.
+        """
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        with self._readers_lock:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._readers_created = 0
+
+    def store_analysis_result(self, log_entry: str, root_cause: str):
+        """
+        Queue a log analysis result for the next batched commit. Use flush() or
+        store_analysis_result_sync() when the row must be on disk before returning.
+
+        Args:
+            log_entry (str): The original log entry.
+            root_cause (str): The root cause identified by GPT.
+        """
+        with self._pending_lock:
+            self._pending.append((log_entry, root_cause))
+            flush_now = len(self._pending) >= COMMIT_BATCH_SIZE
+            if not flush_now:
+                self._start_flush_timer()
+        if flush_now:
+            self.flush()
+
+    def _start_flush_timer(self):
+        """
+        Schedule a flush COMMIT_INTERVAL_SECONDS from now, unless one is already
+        scheduled. Call with _pending_lock held.
+        """
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(COMMIT_INTERVAL_SECONDS, self._flush_on_timer)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_on_timer(self):
+        """
+        Timer callback for flush(). Nobody joins the timer thread, so a failure is only
+        logged; the rows stay queued and the flush is retried after another interval.
+        """
+        with suppress(Exception):
+            self.flush()
+
+    def flush(self):
+        """
+        Commit all queued analysis results in a single transaction. If the commit fails,
+        the rows are put back in the queue, and a timed retry is scheduled, before the
+        error is raised.
+        """
+        with self._pending_lock:
+            rows = self._pending[:]
+            self._pending.clear()
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        if not rows:
+            return
+
+        try:
+            with self.writer_conn() as conn:
+                conn.executemany(INSERT_ANALYSIS_QUERY, rows)
+            logging.info("Committed %s queued log analyses.", len(rows))
+        except Exception as e:
+            logging.error("Error committing queued log analyses: %s", e)
+            with self._pending_lock:
+                # Ahead of anything queued since, so the original order is kept
+                self._pending[:0] = rows
+                # Otherwise the rows would wait for the next store_analysis_result()
+                self._start_flush_timer()
+            raise
+
+    def store_analysis_result_sync(self, log_entry: str, root_cause: str):
+        """
+        Store a single log analysis result, committing before returning.
+
+        Args:
+            log_entry (str): The original log entry.
+            root_cause (str): The root cause identified by GPT.
+        """
+        try:
+            with self.writer_conn() as conn:
+                conn.execute(INSERT_ANALYSIS_QUERY, (log_entry, root_cause))
+            logging.info("Stored log analysis: %s...", log_entry[:30])
+        except Exception as e:
+            logging.error("Error storing log analysis: %s", e)
+            raise
+
+    def store_batch_analysis_results(self, batch_results: List[Dict[str, str]]):
+        """
+        Store a batch of log analysis results in one transaction.
+
+        Args:
+            batch_results (List[Dict[str, str]]): Log entries ('log') with their 'root_cause'.
+        """
+        try:
+            with self.writer_conn() as conn:
+                conn.executemany(INSERT_ANALYSIS_QUERY, [(result['log'], result['root_cause']) for result in batch_results])
+            logging.info("Successfully stored %s batch log analyses.", len(batch_results))
+        except Exception as e:
+            logging.error("Error storing batch log analysis: %s", e)
+            raise
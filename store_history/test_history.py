@@ -1,10 +1,15 @@
 import sqlite3
 import os
 import logging
+import time
+import tempfile
 import unittest
+from unittest.mock import patch
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Union
+import history_store
+from history_store import HistoryStore
 
 # Configure logging for better test tracking
 logging.basicConfig(
@@ -13,6 +18,16 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# Same connection settings as the history store (WAL journaling, relaxed fsync)
+SQLITE_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA busy_timeout=5000;
+    PRAGMA cache_size=-20000;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA foreign_keys=ON;
+"""
+
 class TestHistory:
     def __init__(self, db_name: str = "logs.db"):
         """
@@ -23,6 +38,7 @@ class TestHistory:
         """
         self.db_name = db_name
         self.conn = sqlite3.connect(self.db_name)
+        self.conn.executescript(SQLITE_PRAGMAS)
         self.cursor = self.conn.cursor()
         self._create_table()
 
@@ -40,19 +56,28 @@ class TestHistory:
         """)
         self.conn.commit()
 
-    def insert_logs(self, logs: List[Dict[str, str]]):
+    def insert_logs(self, logs: List[Union[Dict[str, str], Tuple[str, str, str]]]):
         """
         Insert a list of logs into the database in batch.
 
         Args:
-            logs (List[Dict[str, str]]): List of logs to insert. Each log should have 
-                                         'timestamp', 'log_level', and 'message' keys.
+            logs (List[Union[Dict[str, str], Tuple[str, str, str]]]): List of logs to insert. Each
+                log is either a dict with 'timestamp', 'log_level', and 'message' keys or a
+                (timestamp, log_level, message) tuple, which is bound as-is.
         """
         if logs:
-            self.cursor.executemany("""
-                INSERT INTO logs (timestamp, log_level, message)
-                VALUES (:timestamp, :log_level, :message)
-            """, logs)
+            # Positional binds avoid a per-row dict lookup in the driver
+            if isinstance(logs[0], dict):
+                logs = [(log['timestamp'], log['log_level'], log['message']) for log in logs]
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.cursor.executemany("""
+                    INSERT INTO logs (timestamp, log_level, message)
+                    VALUES (?, ?, ?)
+                """, logs)
+            except Exception:
+                self.conn.rollback()
+                raise
             self.conn.commit()
             logging.info(f"Inserted {len(logs)} logs into the database.")
         else:
@@ -77,6 +102,23 @@ class TestHistory:
         rows = self.cursor.fetchall()
         return [{"timestamp": row[0], "log_level": row[1], "message": row[2]} for row in rows]
 
+    def fetch_logs_dataframe(self, limit: int = 100, offset: int = 0) -> pd.DataFrame:
+        """
+        Fetch logs from the database straight into a DataFrame.
+        
+        Args:
+            limit (int): The maximum number of logs to fetch.
+            offset (int): The number of logs to skip for pagination.
+            
+        Returns:
+            pd.DataFrame: The logs, one column per field.
+        """
+        return pd.read_sql_query("""
+            SELECT timestamp, log_level, message
+            FROM logs
+            LIMIT ? OFFSET ?
+        """, self.conn, params=(limit, offset))
+
     def delete_old_logs(self, days: int):
         """
         Delete logs older than a specified number of days.
@@ -117,6 +159,7 @@ class TestHistoryOperations(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         """Clean up after tests by removing the database file."""
+        cls.history.close()  # checkpoints and removes the -wal/-shm files
         if os.path.exists(cls.db_name):
             os.remove(cls.db_name)
             logging.info(f"Database {cls.db_name} removed.")
@@ -150,7 +193,8 @@ class TestHistoryOperations(unittest.TestCase):
 
     def test_batch_processing(self):
         """Test batch processing of logs."""
-        logs = [{"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "log_level": "DEBUG", "message": f"Log entry {i}"} for i in range(10000)]
+        timestamps = pd.date_range(end=datetime.now(), periods=10000, freq="s").strftime("%Y-%m-%d %H:%M:%S")
+        logs = [(ts, "DEBUG", f"Log entry {i}") for i, ts in enumerate(timestamps)]
         batch_size = 500
         for i in range(0, len(logs), batch_size):
             self.history.insert_logs(logs[i:i+batch_size])
@@ -162,8 +206,7 @@ class TestHistoryOperations(unittest.TestCase):
 
     def test_export_to_dataframe(self):
         """Test exporting logs to a Pandas DataFrame."""
-        logs = self.history.fetch_logs(limit=10)
-        df = pd.DataFrame(logs)
+        df = self.history.fetch_logs_dataframe(limit=10)
         self.assertEqual(len(df), 10, "The DataFrame should contain 10 rows.")
         self.assertIn("timestamp", df.columns, "'timestamp' column should exist.")
         self.assertIn("log_level", df.columns, "'log_level' column should exist.")
@@ -171,5 +214,109 @@ class TestHistoryOperations(unittest.TestCase):
         logging.info("Test export to DataFrame passed.")
 
 
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        """Give each test its own history database with the LogAnalysisHistory table."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.store = HistoryStore(os.path.join(self.tmpdir.name, "history.db"))
+        self.addCleanup(self.store.close)
+        with self.store.writer_conn() as conn:
+            conn.execute("""
+                CREATE TABLE LogAnalysisHistory (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    log_entry TEXT NOT NULL,
+                    root_cause TEXT NOT NULL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+    def count_rows(self) -> int:
+        with self.store.reader_conn() as conn:
+            return conn.execute("SELECT COUNT(*) FROM LogAnalysisHistory").fetchone()[0]
+
+    def test_reader_pool_reuses_connections(self):
+        """Test that released reader connections are reused and the pool stays bounded."""
+        with patch.object(history_store, "READER_POOL_SIZE", 2):
+            with self.store.reader_conn() as first, self.store.reader_conn() as second:
+                self.assertIsNot(first, second, "Concurrent borrows should get separate connections.")
+            with self.store.reader_conn() as third:
+                self.assertIn(third, (first, second), "A released connection should be reused.")
+        self.assertEqual(self.store._readers_created, 2)
+
+    def test_writer_conn_rolls_back_on_error(self):
+        """Test that a failed write transaction leaves no rows behind."""
+        with self.assertRaises(sqlite3.IntegrityError):
+            with self.store.writer_conn() as conn:
+                conn.execute("INSERT INTO LogAnalysisHistory (log_entry, root_cause) VALUES ('a', 'b')")
+                conn.execute("INSERT INTO LogAnalysisHistory (log_entry, root_cause) VALUES ('a', NULL)")
+        self.assertEqual(self.count_rows(), 0)
+
+    def test_store_analysis_result_sync_and_batch(self):
+        """Test the immediate single-row and batch stores."""
+        self.store.store_analysis_result_sync("ERROR: Link down", "Cable unplugged")
+        self.store.store_batch_analysis_results([
+            {"log": "ERROR: Disk full", "root_cause": "Log rotation disabled"},
+            {"log": "ERROR: Timeout", "root_cause": "Upstream overloaded"},
+        ])
+        self.assertEqual(self.count_rows(), 3)
+
+    def wait_for_rows(self, expected: int, timeout: float = 5.0) -> int:
+        deadline = time.monotonic() + timeout
+        while (count := self.count_rows()) != expected and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return count
+
+    def test_store_analysis_result_commits_full_batches(self):
+        """Test that queued rows are committed as soon as a batch is full."""
+        with patch.object(history_store, "COMMIT_BATCH_SIZE", 3), \
+                patch.object(history_store, "COMMIT_INTERVAL_SECONDS", 60):
+            for i in range(2):
+                self.store.store_analysis_result(f"ERROR: {i}", "cause")
+            self.assertEqual(self.count_rows(), 0, "A partial batch should wait.")
+            self.store.store_analysis_result("ERROR: 2", "cause")
+            self.assertEqual(self.count_rows(), 3, "A full batch should be committed immediately.")
+            self.store.flush()
+
+    def test_store_analysis_result_flushes_on_timer(self):
+        """Test that a partial batch is committed once the commit interval passes."""
+        with patch.object(history_store, "COMMIT_INTERVAL_SECONDS", 0.01):
+            self.store.store_analysis_result("ERROR: Link down", "Cable unplugged")
+            self.assertEqual(self.wait_for_rows(1), 1)
+
+    def test_failed_flush_keeps_rows_queued(self):
+        """Test that rows whose commit fails, including on the timer thread, are retried later."""
+        with self.store.writer_conn() as conn:
+            conn.execute("ALTER TABLE LogAnalysisHistory RENAME TO Unavailable")
+        with patch.object(history_store, "COMMIT_INTERVAL_SECONDS", 60):
+            self.store.store_analysis_result("ERROR: Link down", "Cable unplugged")
+            with self.assertRaises(sqlite3.OperationalError):
+                self.store.flush()
+        self.assertEqual(self.store._pending, [("ERROR: Link down", "Cable unplugged")], "A failed flush should keep its rows.")
+
+        with patch.object(history_store, "COMMIT_INTERVAL_SECONDS", 0.01):
+            # What the timer thread runs: the failure is swallowed and a retry scheduled
+            self.store._flush_on_timer()
+            self.assertEqual(len(self.store._pending), 1)
+            self.assertIsNotNone(self.store._flush_timer, "A failed timer flush should schedule a retry.")
+
+            with self.store.writer_conn() as conn:
+                conn.execute("ALTER TABLE Unavailable RENAME TO LogAnalysisHistory")
+            self.assertEqual(self.wait_for_rows(1), 1, "The retry should commit the rows without another store.")
+        self.assertEqual(self.store._pending, [])
+
+    def test_history_manager_store_does_not_raise(self):
+        """Test that the module-level store only logs a failed commit of a full batch."""
+        import history_manager
+        with self.store.writer_conn() as conn:
+            conn.execute("DROP TABLE LogAnalysisHistory")
+        with patch.object(history_manager, "_store", self.store), \
+                patch.object(history_store, "COMMIT_BATCH_SIZE", 1), \
+                patch.object(history_store, "COMMIT_INTERVAL_SECONDS", 60):
+            history_manager.store_analysis_result("ERROR: Link down", "Cable unplugged")
+        self.assertEqual(self.store._pending, [("ERROR: Link down", "Cable unplugged")])
+        self.store._flush_timer.cancel()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,22 +1,95 @@
 import re
+import mmap
 import logging
+from itertools import islice, repeat
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Generator
+from typing import List, Dict, Generator, Tuple, Union
 import os
 from datetime import datetime
+import sys
+
+# The shared logging setup lives at the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from logging_setup import setup_queue_logging, setup_file_logging
+
+# Optional multi-pattern matchers for large keyword lists, in order of preference
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# pyarrow's multithreaded CSV writer, with pandas' to_csv as the fallback; Parquet output needs pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = None
 
 # Set up logging for structuring
-logging.basicConfig(
-    filename="structurer.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+LOG_FILE = "structurer.log"
+setup_queue_logging(LOG_FILE)
 
-# Regex patterns for log parsing (example)
+# Regex patterns for log parsing (example). LOG_PATTERN documents the line layout;
+# lines are parsed with LOG_LINE_PATTERN and LOG_TEXT_LINE_PATTERN below.
 LOG_PATTERN = re.compile(r'(?P<timestamp>\S+\s+\S+)\s+(?P<log_level>\S+)\s+(?P<message>.+)')
 
+# LOG_PATTERN applied to each stripped line of a raw byte buffer. Field separators
+# may not cross line breaks, and surrounding whitespace is left out of the match.
+# Anchored to line starts, so the stdlib engine scans in linear time.
+LOG_LINE_PATTERN = re.compile(
+    rb'^[^\S\n]*(?P<timestamp>\S+[^\S\n]+\S+)[^\S\n]+(?P<log_level>\S+)[^\S\n]+(?P<message>[^\n]*?\S)[^\S\n]*$',
+    re.MULTILINE
+)
+
+# LOG_LINE_PATTERN over decoded text, where \s also matches \x1c-\x1f and Unicode spaces
+# such as U+00A0, as it does for str.split in filter_and_structure_logs
+LOG_TEXT_LINE_PATTERN = re.compile(LOG_LINE_PATTERN.pattern.decode(), re.MULTILINE)
+
+# Rows per Parquet row group. Readers skip whole row groups using their min/max
+# statistics, so smaller groups prune more finely at the cost of a larger footer.
+PARQUET_ROW_GROUP_SIZE = 128 * 1024
+
+# Default number of log lines per chunk: large enough that per-chunk overhead
+# (DataFrame construction, cleaning calls, logging) is negligible
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Bytes of a memory-mapped log file tokenized at once by read_structured_logs
+PARSE_BLOCK_BYTES = 16 << 20
+
+# Buffer size for line-by-line reads, so the file is read in few, large system calls
+READ_BUFFER_SIZE = 1 << 20
+# Buffer size for the error log, so it is written in few, large system calls
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Layout of the partitioned Parquet output: one date=YYYY-MM-DD/log_level=LEVEL directory
+# per day and level, so date and level filters skip whole directories unopened
+if pa is not None:
+    PARQUET_PARTITIONING = ds.partitioning(
+        pa.schema([("date", pa.date32()), ("log_level", pa.string())]), flavor="hive"
+    )
+
+# Files smaller than this are processed in-process; process start-up would cost more than it saves
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+
+# Keyword lists at least this long are matched with a multi-pattern automaton
+# (Hyperscan or Aho-Corasick) instead of one alternation regex
+KEYWORD_AUTOMATON_MIN = 16
+
+# Timestamp layout written by the log producers; parsed on pandas' fast path
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 # Function to read logs in chunks to handle large files
-def read_large_log_file(file_path: str, chunk_size: int = 1000) -> Generator[str, None, None]:
+def read_large_log_file(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Generator[str, None, None]:
     """
     Reads a large log file line by line in chunks to avoid memory overload.
     
@@ -27,64 +100,284 @@ def read_large_log_file(file_path: str, chunk_size: int = 1000) -> Generator[str
     Yields:
         str: The next chunk of log lines.
     """
-    with open(file_path, 'r', encoding='utf-8') as file:
-        chunk = []
-        for line in file:
-            chunk.append(line.strip())
-            if len(chunk) >= chunk_size:
-                yield chunk
-                chunk = []
-        if chunk:
+    with open(file_path, 'r', encoding='utf-8', buffering=READ_BUFFER_SIZE) as file:
+        while True:
+            chunk = [line.strip() for line in islice(file, chunk_size)]
+            if not chunk:
+                break
             yield chunk
 
+# ASCII whitespace other than the newline, i.e. what \s matches within a line in a bytes pattern
+_BLANK_BYTES = np.zeros(256, dtype=bool)
+_BLANK_BYTES[[9, 11, 12, 13, 32]] = True
+
+# UTF-8 encodings of the characters that are whitespace in text but not in bytes (every
+# one is below U+3001), as big-endian integer codes grouped by length, and a mask of
+# their first bytes
+_TEXT_ONLY_BLANKS = [c.encode() for c in map(chr, range(0x3001)) if c.isspace() and not c.encode().isspace()]
+_TEXT_ONLY_BLANK_CODES = {
+    length: np.array([int.from_bytes(blank, "big") for blank in _TEXT_ONLY_BLANKS if len(blank) == length], dtype=np.uint32)
+    for length in (1, 2, 3)
+}
+_TEXT_ONLY_BLANK_LEADS = np.zeros(256, dtype=bool)
+_TEXT_ONLY_BLANK_LEADS[[blank[0] for blank in _TEXT_ONLY_BLANKS]] = True
+
+# Function to detect whitespace that bytes patterns and _BLANK_BYTES do not treat as such
+def _has_text_only_blanks(buf: np.ndarray) -> bool:
+    """
+    Tells whether a UTF-8 buffer contains any of _TEXT_ONLY_BLANKS, comparing the bytes
+    after every candidate first byte at once rather than searching sequence by sequence.
+    """
+    candidates = np.flatnonzero(_TEXT_ONLY_BLANK_LEADS[buf])
+    last = len(buf) - 1
+    codes = buf[candidates].astype(np.uint32)
+    for length in (1, 2, 3):
+        if length > 1:
+            codes = (codes << 8) | buf[np.minimum(candidates + length - 1, last)]
+        if np.isin(codes, _TEXT_ONLY_BLANK_CODES[length]).any():
+            return True
+    return False
+
+# Function to copy byte ranges of a buffer into one Arrow string array
+def _gather_strings(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+    """
+    Builds an Arrow string array whose i-th value is buf[starts[i]:ends[i]], with one
+    vectorized gather instead of a bytes object per value.
+    """
+    lengths = ends - starts
+    offsets = np.zeros(len(starts) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+    strings = pa.LargeStringArray.from_buffers(len(starts), pa.py_buffer(offsets), pa.py_buffer(buf[positions]))
+    strings.validate(full=True)  # raises on invalid UTF-8, like bytes.decode
+    return strings
+
+# Function to tokenize a block of complete log lines with array operations
+def _parse_log_block(block: bytes) -> pd.DataFrame:
+    """
+    Vectorized equivalent of LOG_LINE_PATTERN.finditer over a block of complete lines.
+    Words are located with numpy masks over the raw bytes, and each line's first four
+    words give its fields: the timestamp spans words 0-1, the log level is word 2 and
+    the message runs from word 3 to the line's last word. Lines with fewer than four
+    words are skipped.
+
+    Blocks containing whitespace that only text patterns recognize (e.g. a no-break
+    space) are decoded and matched with LOG_TEXT_LINE_PATTERN instead, so they split
+    into the same fields as in `filter_and_structure_logs`.
+    """
+    buf = np.frombuffer(block, dtype=np.uint8)
+    if _has_text_only_blanks(buf):
+        matches = LOG_TEXT_LINE_PATTERN.findall(block.decode('utf-8'))
+        return pd.DataFrame(matches, columns=["timestamp", "log_level", "message"])
+
+    newlines = np.flatnonzero(buf == 10)
+    in_word = ~_BLANK_BYTES[buf]
+    in_word[newlines] = False
+    edges = np.diff(in_word.view(np.int8), prepend=np.int8(0), append=np.int8(0))
+    word_starts = np.flatnonzero(edges == 1)
+    word_ends = np.flatnonzero(edges == -1)
+    
+    # Position of each word within its line
+    word_lines = np.searchsorted(newlines, word_starts)
+    first_words = np.searchsorted(word_lines, word_lines, side='left')
+    fourth_words = np.flatnonzero(np.arange(len(word_starts)) - first_words == 3)
+    line_starts = first_words[fourth_words]
+    last_words = np.searchsorted(word_lines, word_lines[fourth_words], side='right') - 1
+    
+    table = pa.table({
+        "timestamp": _gather_strings(buf, word_starts[line_starts], word_ends[line_starts + 1]),
+        "log_level": _gather_strings(buf, word_starts[line_starts + 2], word_ends[line_starts + 2]),
+        "message": _gather_strings(buf, word_starts[fourth_words], word_ends[last_words]),
+    })
+    return table.to_pandas()
+
+# Function to parse a large log file straight from a memory map, chunk by chunk
+def read_structured_logs(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, start: int = 0, end: int = None) -> Generator[pd.DataFrame, None, None]:
+    """
+    Memory-maps a log file and parses it without touching lines one by one in Python,
+    yielding structured chunks. Equivalent to `read_large_log_file` followed by
+    `filter_and_structure_logs`.
+    
+    With pyarrow available, the file is tokenized PARSE_BLOCK_BYTES at a time with numpy
+    (see `_parse_log_block`); otherwise it is scanned with LOG_LINE_PATTERN.
+    
+    Args:
+        file_path (str): Path to the log file.
+        chunk_size (int): The number of log entries per chunk.
+        start (int): Byte offset to start scanning at; must be the start of a line.
+        end (int): Byte offset to stop scanning at (default: end of file); must be the end of a line.
+        
+    Yields:
+        pd.DataFrame: The next chunk of log entries with timestamp, log level, and message columns.
+    """
+    if os.path.getsize(file_path) == 0:
+        return  # mmap cannot map an empty file
+    
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        end = len(mapped) if end is None else end
+        if pa is not None:
+            pending = None
+            while start < end:
+                # Cut each block just after a newline so no line is split
+                block_end = min(end, start + PARSE_BLOCK_BYTES)
+                if block_end < end:
+                    newline = mapped.find(b'\n', block_end - 1, end)
+                    block_end = end if newline == -1 else newline + 1
+                parsed = _parse_log_block(mapped[start:block_end])
+                start = block_end
+                
+                pending = parsed if pending is None else pd.concat([pending, parsed], ignore_index=True)
+                while len(pending) >= chunk_size:
+                    yield pending.iloc[:chunk_size].reset_index(drop=True)
+                    pending = pending.iloc[chunk_size:]
+            if pending is not None and len(pending):
+                yield pending.reset_index(drop=True)
+            return
+        
+        matches = LOG_LINE_PATTERN.finditer(mapped, start, end)
+        try:
+            while True:
+                batch = [match.groups() for match in islice(matches, chunk_size)]
+                if not batch:
+                    break
+                chunk = pd.DataFrame(batch, columns=["timestamp", "log_level", "message"])
+                yield chunk.apply(lambda column: column.str.decode('utf-8'))
+        finally:
+            # The scanner holds a view of the map; release it so the map can close
+            # even when the caller stops iterating early
+            del matches
+
 # Log filtering and data structuring
-def filter_and_structure_logs(log_lines: List[str]) -> List[Dict[str, str]]:
+def filter_and_structure_logs(log_lines: List[str]) -> pd.DataFrame:
     """
-    Filters and structures the log lines into a list of dictionaries based on the defined pattern.
+    Filters and structures the log lines into a DataFrame based on the defined pattern.
     
     Args:
         log_lines (List[str]): The list of log lines to process.
     
     Returns:
-        List[Dict[str, str]]: A structured list of log entries with timestamp, log level, and message.
+        pd.DataFrame: A structured table of log entries with timestamp, log level, and message columns.
     """
-    structured_logs = []
-    
+    # Plain str.split per line and one columnar DataFrame build; equivalent to matching
+    # LOG_PATTERN at the start of each line (the date/time separator becomes one space)
+    timestamps, log_levels, messages = [], [], []
     for line in log_lines:
-        match = LOG_PATTERN.match(line)
-        if match:
-            log_entry = match.groupdict()
-            structured_logs.append(log_entry)
-        else:
-            logging.warning(f"Skipped malformed log entry: {line}")
+        if not isinstance(line, str) or line[:1].isspace():
+            continue
+        fields = line.split(None, 3)
+        if len(fields) == 4:
+            timestamps.append(f"{fields[0]} {fields[1]}")
+            log_levels.append(fields[2])
+            messages.append(fields[3].partition("\n")[0])
+    structured_logs = pd.DataFrame({"timestamp": timestamps, "log_level": log_levels, "message": messages})
+    
+    skipped = len(log_lines) - len(structured_logs)
+    if skipped:
+        logging.warning("Skipped %s malformed log entries.", skipped)
     
     return structured_logs
 
+# Function to compile a keyword list into a reusable multi-pattern matcher
+@lru_cache(maxsize=8)
+def _keyword_automaton(keywords: Tuple[str, ...]):
+    """
+    Compiles keywords into a Hyperscan literal database, or an Aho-Corasick automaton
+    when Hyperscan is unavailable. Cached, since the same keywords clean every chunk.
+    """
+    if hyperscan is not None:
+        database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        database.compile(expressions=[kw.encode('utf-8') for kw in keywords], ids=list(range(len(keywords))), literal=True)
+        return database
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
+# Function to flag messages containing any of the keywords
+def contains_any_keyword(messages: pd.Series, keywords: List[str]) -> np.ndarray:
+    """
+    Flags the messages that contain at least one of the keywords (case-sensitive).
+    
+    Large keyword lists are matched with a multi-pattern automaton over all messages
+    joined into one buffer, so each message is scanned once regardless of the number
+    of keywords. Arrow-backed strings, and short lists, use a single alternation
+    regex, which for Arrow strings already runs on a linear-time engine.
+    
+    Args:
+        messages (pd.Series): The log messages.
+        keywords (List[str]): Keywords to look for.
+    
+    Returns:
+        np.ndarray: Boolean mask, True where a message contains a keyword.
+    """
+    keywords = tuple(dict.fromkeys(keywords))
+    if "" in keywords:
+        return np.ones(len(messages), dtype=bool)
+    
+    use_automaton = (
+        len(keywords) >= KEYWORD_AUTOMATON_MIN
+        and (hyperscan is not None or ahocorasick is not None)
+        and getattr(messages.dtype, "storage", None) != "pyarrow"
+        # Messages are joined with newlines, so keywords must not contain one
+        and not any("\n" in kw for kw in keywords)
+    )
+    if not use_automaton:
+        keyword_pattern = '|'.join(map(re.escape, keywords))
+        return messages.str.contains(keyword_pattern, regex=True, na=False).to_numpy(dtype=bool)
+    
+    messages = messages.fillna("")
+    automaton = _keyword_automaton(keywords)
+    if hyperscan is not None:
+        encoded = messages.str.encode('utf-8')
+        # Offset just past each message's separator in the joined buffer
+        ends = np.cumsum(encoded.str.len().to_numpy() + 1)
+        match_ends = []
+        automaton.scan(b"\n".join(encoded), match_event_handler=lambda _id, _start, end, _flags, _ctx: match_ends.append(end - 1))
+    else:
+        ends = np.cumsum(messages.str.len().to_numpy() + 1)
+        match_ends = [end for end, _ in automaton.iter("\n".join(messages))]
+    
+    mask = np.zeros(len(messages), dtype=bool)
+    if match_ends:
+        mask[np.searchsorted(ends, match_ends, side='right')] = True
+    return mask
+
 # Function to clean logs (e.g., remove irrelevant logs based on log level or keywords)
-def clean_logs(logs: List[Dict[str, str]], exclude_keywords: List[str] = None, exclude_log_levels: List[str] = None) -> List[Dict[str, str]]:
+def clean_logs(logs: Union[pd.DataFrame, List[Dict[str, str]]], exclude_keywords: List[str] = None, exclude_log_levels: List[str] = None) -> Union[pd.DataFrame, List[Dict[str, str]]]:
     """
     Cleans the logs by removing entries based on specified keywords or log levels.
     
     Args:
-        logs (List[Dict[str, str]]): List of structured log entries.
+        logs (Union[pd.DataFrame, List[Dict[str, str]]]): Structured log entries, as a DataFrame or a list of log dictionaries.
         exclude_keywords (List[str]): List of keywords to exclude from logs.
         exclude_log_levels (List[str]): List of log levels to exclude.
     
     Returns:
-        List[Dict[str, str]]: The cleaned list of logs.
+        Union[pd.DataFrame, List[Dict[str, str]]]: The cleaned logs, in the same form as `logs`.
     """
     if exclude_keywords is None:
         exclude_keywords = []
     if exclude_log_levels is None:
         exclude_log_levels = []
+    if not isinstance(logs, pd.DataFrame):
+        # Filter the dictionaries directly; use store_logs_in_dataframe for a DataFrame
+        excluded_levels = frozenset(exclude_log_levels)
+        keyword_pattern = re.compile('|'.join(map(re.escape, dict.fromkeys(exclude_keywords)))) if exclude_keywords else None
+        cleaned_logs = [
+            log for log in logs
+            if log['log_level'] not in excluded_levels
+            and not (keyword_pattern and keyword_pattern.search(log['message'] or ""))
+        ]
+        logging.info("Cleaned %s logs based on filter criteria.", len(logs) - len(cleaned_logs))
+        return cleaned_logs
     
-    cleaned_logs = [
-        log for log in logs
-        if not any(keyword in log['message'] for keyword in exclude_keywords) 
-        and log['log_level'] not in exclude_log_levels
-    ]
+    keep = ~logs['log_level'].isin(exclude_log_levels)
+    if exclude_keywords:
+        keep &= ~contains_any_keyword(logs['message'], exclude_keywords)
+    cleaned_logs = logs[keep]
     
-    logging.info(f"Cleaned {len(logs) - len(cleaned_logs)} logs based on filter criteria.")
+    logging.info("Cleaned %s logs based on filter criteria.", len(logs) - len(cleaned_logs))
     return cleaned_logs
 
 # Function to store structured logs into a dataframe for easy further analysis
@@ -93,46 +386,124 @@ def store_logs_in_dataframe(logs: List[Dict[str, str]]) -> pd.DataFrame:
     Converts the structured log entries into a pandas DataFrame for further analysis.
     
     Args:
-        logs (List[Dict[str, str]]): The structured log entries.
+        logs (List[Dict[str, str]]): The structured log entries (or a DataFrame of them).
     
     Returns:
         pd.DataFrame: A DataFrame containing the structured log data.
     """
-    if logs:
+    if len(logs):
         df = pd.DataFrame(logs)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-        logging.info(f"Structured {len(df)} logs into DataFrame.")
+        timestamps = pd.to_datetime(df['timestamp'], format=TIMESTAMP_FORMAT, errors='coerce', cache=True)
+        # Fall back to per-value format inference only for timestamps in some other layout
+        other_format = timestamps.isna() & df['timestamp'].notna()
+        if other_format.any():
+            # mask() rather than assignment: the inferred values may need a finer unit (e.g. microseconds)
+            timestamps = timestamps.mask(other_format, pd.to_datetime(df.loc[other_format, 'timestamp'], format='mixed', errors='coerce'))
+        df['timestamp'] = timestamps
+        logging.info("Structured %s logs into DataFrame.", len(df))
         return df
     else:
         logging.warning("No logs to structure into DataFrame.")
         return pd.DataFrame()
 
+# Function to split a log file into byte ranges that begin and end on line boundaries
+def split_log_file(file_path: str, parts: int) -> List[Tuple[int, int]]:
+    """
+    Splits a log file into roughly equal byte ranges, each ending just after a newline.
+    
+    Args:
+        file_path (str): Path to the log file.
+        parts (int): The number of ranges to aim for.
+    
+    Returns:
+        List[Tuple[int, int]]: (start, end) byte offsets covering the whole file.
+    """
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return []
+    
+    bounds = [0]
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for i in range(1, parts):
+            newline = mapped.find(b'\n', max(size * i // parts, bounds[-1]))
+            if newline == -1:
+                break
+            if newline + 1 < size:
+                bounds.append(newline + 1)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+# Function to structure and clean one byte range of a log file
+def _process_range(file_path: str, start: int, end: int, chunk_size: int, exclude_keywords: List[str], exclude_log_levels: List[str]) -> pd.DataFrame:
+    """
+    Structures and cleans the logs in one byte range of a file. Top-level so that it
+    can be sent to worker processes.
+    """
+    cleaned_chunks = []
+    for structured_chunk in read_structured_logs(file_path, chunk_size, start, end):
+        logging.info("Processing chunk with %s log entries.", len(structured_chunk))
+        cleaned_chunks.append(clean_logs(structured_chunk, exclude_keywords, exclude_log_levels))
+    if not cleaned_chunks:
+        return pd.DataFrame(columns=["timestamp", "log_level", "message"])
+    return pd.concat(cleaned_chunks, ignore_index=True)
+
 # Function to process a large log file, clean and structure it
-def process_large_log_file(file_path: str, chunk_size: int = 1000, exclude_keywords: List[str] = None, exclude_log_levels: List[str] = None) -> pd.DataFrame:
+def process_large_log_file(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, exclude_keywords: List[str] = None, exclude_log_levels: List[str] = None, max_workers: int = None) -> pd.DataFrame:
     """
     Processes a large log file in chunks, cleans and structures it into a pandas DataFrame.
     
+    Files of at least PARALLEL_MIN_BYTES are split into line-aligned byte ranges that
+    are parsed and cleaned in parallel worker processes.
+    
     Args:
         file_path (str): Path to the log file.
         chunk_size (int): The number of lines to process at once.
         exclude_keywords (List[str]): List of keywords to exclude from logs.
         exclude_log_levels (List[str]): List of log levels to exclude.
+        max_workers (int): Number of worker processes (default: os.cpu_count()).
     
     Returns:
         pd.DataFrame: A DataFrame containing the structured log data.
     """
-    structured_logs = []
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers > 1 and os.path.getsize(file_path) >= PARALLEL_MIN_BYTES:
+        ranges = split_log_file(file_path, max_workers)
+    else:
+        ranges = [(0, None)]
     
-    for chunk in read_large_log_file(file_path, chunk_size):
-        logging.info(f"Processing chunk with {len(chunk)} log entries.")
-        structured_chunk = filter_and_structure_logs(chunk)
-        cleaned_chunk = clean_logs(structured_chunk, exclude_keywords, exclude_log_levels)
-        structured_logs.extend(cleaned_chunk)
+    if len(ranges) > 1:
+        starts, ends = zip(*ranges)
+        # Workers write the log file directly: the queue handler they inherit has no listener
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=setup_file_logging, initargs=(LOG_FILE,)) as executor:
+            # map() returns results in submission order, so the file order is preserved
+            cleaned_ranges = list(executor.map(
+                _process_range, repeat(file_path), starts, ends,
+                repeat(chunk_size), repeat(exclude_keywords), repeat(exclude_log_levels)
+            ))
+    else:
+        cleaned_ranges = [_process_range(file_path, 0, None, chunk_size, exclude_keywords, exclude_log_levels)]
     
-    # Once all logs are processed, store them in a DataFrame
+    # Once all logs are processed, store them in a single DataFrame
+    structured_logs = pd.concat(cleaned_ranges, ignore_index=True)
     df = store_logs_in_dataframe(structured_logs)
+    if 'log_level' in df.columns:
+        # A handful of distinct levels: store a small integer code per row instead of a string
+        df['log_level'] = df['log_level'].astype('category')
     return df
 
+def _needs_csv_quoting(table) -> bool:
+    """
+    Whether any text value of `table` contains a character that must be quoted in CSV.
+    """
+    for column in table.columns:
+        column_type = column.type
+        if pa.types.is_dictionary(column_type):
+            column_type = column_type.value_type
+        if pa.types.is_string(column_type) or pa.types.is_large_string(column_type):
+            if pc.any(pc.match_substring_regex(column.cast(column_type), r'[,"\r\n]')).as_py():
+                return True
+    return False
+
 # Example function to save the structured DataFrame to CSV
 def save_dataframe_to_csv(df: pd.DataFrame, output_file: str):
     """
@@ -143,7 +514,128 @@ def save_dataframe_to_csv(df: pd.DataFrame, output_file: str):
         output_file (str): Path where to save the CSV file.
     """
     if not df.empty:
-        df.to_csv(output_file, index=False)
-        logging.info(f"Structured data saved to {output_file}")
+        # Same layout as pandas' to_csv: timestamps in TIMESTAMP_FORMAT (plus the fraction,
+        # for values that have one), so readers can compare them as text, and no quotes
+        # unless some value contains a delimiter, quote or line break (Arrow can then only
+        # quote every text value)
+        if pa is not None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if "timestamp" in table.column_names and pa.types.is_timestamp(table.schema.field("timestamp").type):
+                timestamps = table.column("timestamp")
+                # %S prints the fraction for units finer than seconds
+                whole_seconds = pc.equal(pc.floor_temporal(timestamps, unit="second"), timestamps)
+                timestamps = pc.if_else(
+                    whole_seconds,
+                    pc.strftime(timestamps.cast(pa.timestamp("s"), safe=False), format=TIMESTAMP_FORMAT),
+                    pc.strftime(timestamps, format=TIMESTAMP_FORMAT)
+                )
+                table = table.set_column(table.schema.get_field_index("timestamp"), "timestamp", timestamps)
+            quoting_style = "needed" if _needs_csv_quoting(table) else "none"
+            pacsv.write_csv(table, output_file, write_options=pacsv.WriteOptions(batch_size=65536, quoting_style=quoting_style))
+        else:
+            if pd.api.types.is_datetime64_any_dtype(df["timestamp"]):
+                timestamps = df["timestamp"]
+                whole_seconds = timestamps == timestamps.dt.floor("s")
+                df = df.assign(timestamp=timestamps.dt.strftime(TIMESTAMP_FORMAT).where(
+                    whole_seconds, timestamps.dt.strftime(TIMESTAMP_FORMAT + ".%f")
+                ))
+            df.to_csv(output_file, index=False)
+        logging.info("Structured data saved to %s", output_file)
     else:
         logging.warning("No data to save.")
+
+# Function to save only the error entries as log lines, for views that show nothing else
+def save_error_logs(df: pd.DataFrame, output_file: str, log_level: str = "ERROR"):
+    """
+    Writes the entries of one log level back out as log lines, so readers interested
+    only in errors read a file proportional to the error count instead of the full log.
+    
+    Args:
+        df (pd.DataFrame): The structured logs.
+        output_file (str): Path where to save the error log.
+        log_level (str): The level to keep.
+    """
+    if df.empty:
+        logging.warning("No data to save.")
+        return
+    
+    errors = df[df['log_level'] == log_level]
+    timestamps = errors['timestamp']
+    if pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = timestamps.dt.strftime(TIMESTAMP_FORMAT)
+    lines = timestamps.fillna("").astype(str) + " " + log_level + " " + errors['message'].astype(str) + "\n"
+    with open(output_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as file:
+        file.writelines(lines)
+    logging.info("%s %s entries saved to %s", len(errors), log_level, output_file)
+
+def _millisecond_timestamps(column):
+    """
+    Floor a timestamp column to milliseconds, the unit the Parquet outputs are stored in.
+    (A plain cast raises on sub-millisecond values instead of dropping them.)
+    """
+    return pc.floor_temporal(column, unit="millisecond").cast(pa.timestamp("ms"))
+
+# Function to save the structured DataFrame to Parquet for filtered reads
+def save_dataframe_to_parquet(df: pd.DataFrame, output_file: str):
+    """
+    Saves the structured logs DataFrame to a zstd-compressed Parquet file, sorted by
+    timestamp (and marked as such) so that time-range filters can skip whole row groups.
+    
+    Args:
+        df (pd.DataFrame): The DataFrame to save.
+        output_file (str): Path where to save the Parquet file.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required to write Parquet files.")
+    if df.empty:
+        logging.warning("No data to save.")
+        return
+    
+    df = df.sort_values("timestamp", kind="stable")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Millisecond timestamps keep the row group statistics numeric and comparable
+    timestamp_index = table.schema.get_field_index("timestamp")
+    table = table.set_column(timestamp_index, "timestamp", _millisecond_timestamps(table.column("timestamp")))
+    # Record the order in the file metadata so readers can binary-search the time range
+    pq.write_table(
+        table, output_file, compression="zstd", row_group_size=PARQUET_ROW_GROUP_SIZE,
+        sorting_columns=[pq.SortingColumn(timestamp_index)]
+    )
+    logging.info("Structured data saved to %s", output_file)
+
+# Function to save the structured DataFrame as a Parquet dataset partitioned by day and level
+def save_dataframe_to_partitioned_parquet(df: pd.DataFrame, output_dir: str):
+    """
+    Saves the structured logs DataFrame as a Parquet dataset under `output_dir`, laid out
+    by PARQUET_PARTITIONING. Partitions present in `df` are replaced; others are kept.
+    
+    Args:
+        df (pd.DataFrame): The DataFrame to save.
+        output_dir (str): Directory of the dataset.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required to write Parquet files.")
+    if df.empty:
+        logging.warning("No data to save.")
+        return
+    
+    df = df.sort_values("timestamp", kind="stable")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    timestamps = _millisecond_timestamps(table.column("timestamp"))
+    table = table.set_column(table.schema.get_field_index("timestamp"), "timestamp", timestamps)
+    table = table.set_column(table.schema.get_field_index("log_level"), "log_level", table.column("log_level").cast(pa.string()))
+    table = table.append_column("date", timestamps.cast(pa.date32()))
+    # Partition columns are not stored in the files, which keep the remaining columns in order
+    file_columns = [name for name in table.column_names if name not in PARQUET_PARTITIONING.schema.names]
+    ds.write_dataset(
+        table,
+        output_dir,
+        format="parquet",
+        partitioning=PARQUET_PARTITIONING,
+        existing_data_behavior="delete_matching",
+        preserve_order=True,
+        file_options=ds.ParquetFileFormat().make_write_options(
+            compression="zstd", sorting_columns=[pq.SortingColumn(file_columns.index("timestamp"))]
+        )
+    )
+    logging.info("Structured data saved to %s", output_dir)
@@ -1,8 +1,11 @@
 import unittest
 import os
+import shutil
 import pandas as pd
+from unittest.mock import patch
 from datetime import datetime
-from structurer import read_large_log_file, filter_and_structure_logs, clean_logs, process_large_log_file, save_dataframe_to_csv
+import structurer
+from structurer import read_large_log_file, read_structured_logs, filter_and_structure_logs, clean_logs, process_large_log_file, save_dataframe_to_csv
 
 
 class TestLogProcessing(unittest.TestCase):
@@ -34,12 +37,14 @@ class TestLogProcessing(unittest.TestCase):
             num_entries (int): Number of log entries to write.
         """
         log_levels = ["INFO", "ERROR", "DEBUG", "WARNING"]
+        # One timestamp for the whole file, and the file written in a single call
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        lines = [
+            f"{timestamp} {log_levels[i % 4]} Test log message {i} with {log_levels[i % 4]}\n"
+            for i in range(num_entries)
+        ]
         with open(file_path, 'w', encoding='utf-8') as file:
-            for i in range(num_entries):
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                log_level = log_levels[i % 4]
-                message = f"Test log message {i} with {log_level}"
-                file.write(f"{timestamp} {log_level} {message}\n")
+            file.write("".join(lines))
         print(f"Large log file '{file_path}' created with {num_entries} entries.")
 
     def test_read_large_log_file(self):
@@ -52,11 +57,66 @@ class TestLogProcessing(unittest.TestCase):
             chunk_count += 1
             self.assertTrue(len(chunk) <= chunk_size, "Chunk size exceeded.")
         self.assertGreater(chunk_count, 0, "No chunks were read.")
+        default_chunks = list(read_large_log_file(self.log_file))
+        self.assertEqual(len(default_chunks), 1, "The default chunk size should cover the whole test file.")
+        self.assertEqual(sum(len(chunk) for chunk in default_chunks), 10000)
         print(f"Read {chunk_count} chunks from the large log file.")
 
+    def test_read_structured_logs(self):
+        """
+        Test that the memory-mapped reader matches reading and structuring line by line.
+        """
+        chunks = list(read_structured_logs(self.log_file, chunk_size=1000))
+        self.assertTrue(all(len(chunk) <= 1000 for chunk in chunks), "Chunk size exceeded.")
+        df = pd.concat(chunks, ignore_index=True)
+        expected = pd.concat(
+            [filter_and_structure_logs(chunk) for chunk in read_large_log_file(self.log_file, 1000)],
+            ignore_index=True
+        )
+        self.assertEqual(len(df), 10000, "Every log entry should be parsed.")
+        self.assertEqual(df.values.tolist(), expected.values.tolist(), "Parsed entries should match.")
+
+    def test_read_structured_logs_matches_regex_scan(self):
+        """
+        Test that the vectorized block parser agrees with the regex scanner on irregular lines.
+        """
+        log_file = "test_irregular_log.txt"
+        with open(log_file, "wb") as file:
+            file.write(b"  2024-12-19\t12:00:00  WARNING   Disk  almost full \t\r\n"
+                       b"malformed line\n\n"
+                       b"2024-12-19 12:00:01 ERROR Link down\n"
+                       b"2024-12-19 12:00:02 INFO Link up")
+        self.addCleanup(os.remove, log_file)
+        
+        with patch.object(structurer, "PARSE_BLOCK_BYTES", 16):
+            df = pd.concat(read_structured_logs(log_file, chunk_size=2), ignore_index=True)
+        with patch.object(structurer, "pa", None):
+            expected = pd.concat(read_structured_logs(log_file, chunk_size=2), ignore_index=True)
+        self.assertEqual(df.values.tolist(), expected.values.tolist())
+        self.assertEqual(df["message"].tolist(), ["Disk  almost full", "Link down", "Link up"])
+
+    def test_read_structured_logs_unicode_whitespace(self):
+        """
+        Test that whitespace only text matching recognizes (no-break space, U+2003, \\x1f)
+        separates fields in the block parser just as it does line by line.
+        """
+        log_file = "test_unicode_log.txt"
+        with open(log_file, "w", encoding="utf-8") as file:
+            file.write("2024-12-19\u00a012:00:00 WARNING Disk\u2003almost full\n"
+                       "2024-12-19 12:00:01\x1fERROR Link down é\n"
+                       "2024-12-19 12:00:02 INFO Link up\n")
+        self.addCleanup(os.remove, log_file)
+
+        with patch.object(structurer, "PARSE_BLOCK_BYTES", 40):
+            df = pd.concat(read_structured_logs(log_file, chunk_size=2), ignore_index=True)
+        expected = filter_and_structure_logs(next(read_large_log_file(log_file)))
+        self.assertEqual(df["log_level"].tolist(), expected["log_level"].tolist())
+        self.assertEqual(df["message"].tolist(), expected["message"].tolist())
+        self.assertEqual(df["message"].tolist(), ["Disk\u2003almost full", "Link down é", "Link up"])
+
     def test_filter_and_structure_logs(self):
         """
-        Test filtering and structuring logs into dictionaries.
+        Test filtering and structuring logs into a DataFrame.
         """
         sample_log_lines = [
             "2024-12-19 12:00:00 INFO This is an info log",
@@ -65,11 +125,19 @@ class TestLogProcessing(unittest.TestCase):
         ]
         structured_logs = filter_and_structure_logs(sample_log_lines)
         self.assertEqual(len(structured_logs), 3, "Number of structured logs should be 3.")
-        self.assertIn("timestamp", structured_logs[0], "Structured log entry should contain 'timestamp'.")
-        self.assertIn("log_level", structured_logs[0], "Structured log entry should contain 'log_level'.")
-        self.assertIn("message", structured_logs[0], "Structured log entry should contain 'message'.")
+        self.assertIn("timestamp", structured_logs.columns, "Structured logs should contain 'timestamp'.")
+        self.assertIn("log_level", structured_logs.columns, "Structured logs should contain 'log_level'.")
+        self.assertIn("message", structured_logs.columns, "Structured logs should contain 'message'.")
+        self.assertEqual(structured_logs.iloc[1]["log_level"], "ERROR", "Fields should be split on whitespace.")
         print("Log filtering and structuring passed.")
 
+    def test_log_pattern_rejects_unbroken_line(self):
+        """
+        Test that a long line with no field separators is rejected rather than matched.
+        """
+        self.assertIsNone(structurer.LOG_PATTERN.search("a " + "x" * 5000))
+        self.assertIsNotNone(structurer.LOG_PATTERN.search("2024-01-01 10:00:00 INFO Link up"))
+
     def test_clean_logs(self):
         """
         Test cleaning of irrelevant logs based on log level and keywords.
@@ -86,6 +154,34 @@ class TestLogProcessing(unittest.TestCase):
         self.assertNotIn("INFO", [log["log_level"] for log in cleaned_logs], "INFO log level should be excluded.")
         print("Log cleaning passed.")
 
+    def test_clean_logs_many_keywords(self):
+        """
+        Test keyword cleaning with a keyword list long enough to use the multi-pattern matcher.
+        """
+        keywords = [f"service-{i}" for i in range(structurer.KEYWORD_AUTOMATON_MIN * 2)]
+        logs = [
+            {"timestamp": "2024-12-19 12:00:00", "log_level": "ERROR", "message": f"Timeout calling service-{i} from gateway"}
+            for i in range(0, 100, 3)
+        ]
+        cleaned_logs = clean_logs(logs, exclude_keywords=keywords)
+        expected = [log["message"] for log in logs if not any(kw in log["message"] for kw in keywords)]
+        self.assertEqual([log["message"] for log in cleaned_logs], expected, "Logs containing any keyword should be excluded.")
+        cleaned_df = clean_logs(pd.DataFrame(logs), exclude_keywords=keywords)
+        self.assertEqual(cleaned_df["message"].tolist(), expected, "DataFrames should be cleaned the same way.")
+
+    def test_store_logs_in_dataframe(self):
+        """
+        Test that timestamps in the log format and in other layouts are both parsed.
+        """
+        df = structurer.store_logs_in_dataframe([
+            {"timestamp": "2024-12-19 12:00:00", "log_level": "INFO", "message": "Test info log"},
+            {"timestamp": "2024-12-19T12:00:00.250999", "log_level": "ERROR", "message": "Test error log"}
+        ])
+        self.assertEqual(df["timestamp"].tolist(), [pd.Timestamp("2024-12-19 12:00:00"), pd.Timestamp("2024-12-19 12:00:00.250999")])
+        # Only sub-second timestamps: the parsed column needs a finer unit than whole seconds
+        df = structurer.store_logs_in_dataframe([{"timestamp": "2024-12-19 12:00:00.250999", "log_level": "INFO", "message": "Test info log"}])
+        self.assertEqual(df["timestamp"].tolist(), [pd.Timestamp("2024-12-19 12:00:00.250999")])
+
     def test_process_large_log_file(self):
         """
         Test the ability to process a large log file, clean, and structure it.
@@ -100,8 +196,31 @@ class TestLogProcessing(unittest.TestCase):
         self.assertTrue("timestamp" in df.columns, "'timestamp' column is missing in DataFrame.")
         self.assertTrue("log_level" in df.columns, "'log_level' column is missing in DataFrame.")
         self.assertTrue("message" in df.columns, "'message' column is missing in DataFrame.")
+        self.assertIsInstance(df["log_level"].dtype, pd.CategoricalDtype, "'log_level' should be categorical.")
         print(f"Processed large log file into DataFrame with {len(df)} entries.")
 
+    def test_process_large_log_file_in_parallel(self):
+        """
+        Test that processing a file in parallel byte ranges gives the same result as one pass.
+        """
+        kwargs = dict(chunk_size=1000, exclude_keywords=self.exclude_keywords, exclude_log_levels=self.exclude_log_levels)
+        with patch.object(structurer, "PARALLEL_MIN_BYTES", 0):
+            parallel_df = process_large_log_file(self.log_file, max_workers=2, **kwargs)
+        serial_df = process_large_log_file(self.log_file, max_workers=1, **kwargs)
+        self.assertEqual(len(parallel_df), 7500, "INFO entries should be excluded.")
+        self.assertTrue(parallel_df.equals(serial_df), "Parallel and serial results should match.")
+
+    def test_process_large_log_file_in_parallel_logs_from_workers(self):
+        """
+        Test that log records from the worker processes reach the log file.
+        """
+        log_file = "test_workers.log"
+        self.addCleanup(lambda: os.path.exists(log_file) and os.remove(log_file))
+        with patch.object(structurer, "PARALLEL_MIN_BYTES", 0), patch.object(structurer, "LOG_FILE", log_file):
+            process_large_log_file(self.log_file, chunk_size=1000, max_workers=2)
+        with open(log_file, encoding="utf-8") as file:
+            self.assertIn("Processing chunk with", file.read())
+
     def test_save_dataframe_to_csv(self):
         """
         Test saving the structured DataFrame to a CSV file.
@@ -117,7 +236,92 @@ class TestLogProcessing(unittest.TestCase):
         saved_df = pd.read_csv(output_file)
         self.assertEqual(len(saved_df), 2, "The number of entries in the saved CSV should match.")
         os.remove(output_file)
+        
+        # Parsed timestamps are written back in the log format, unquoted, like pandas' to_csv
+        save_dataframe_to_csv(structurer.store_logs_in_dataframe(df.to_dict(orient="records")), output_file)
+        self.addCleanup(os.remove, output_file)
+        with open(output_file, encoding="utf-8") as file:
+            self.assertEqual(file.read().splitlines()[1], "2024-12-19 12:00:00,ERROR,Test error log")
+        # A value with a delimiter still round-trips
+        save_dataframe_to_csv(pd.DataFrame({"timestamp": ["2024-12-19 12:00:00"], "log_level": ["ERROR"], "message": ["Link down, retrying"]}), output_file)
+        self.assertEqual(pd.read_csv(output_file)["message"].tolist(), ["Link down, retrying"])
+        # Sub-second timestamps keep their fraction; whole seconds stay in the log format
+        df = structurer.store_logs_in_dataframe([
+            {"timestamp": "2024-12-19 09:00:00.25", "log_level": "ERROR", "message": "Test error log"},
+            {"timestamp": "2024-12-19 09:00:01", "log_level": "INFO", "message": "Test info log"}
+        ])
+        for arrow in (structurer.pa, None):
+            with patch.object(structurer, "pa", arrow):
+                save_dataframe_to_csv(df, output_file)
+            saved_df = pd.read_csv(output_file, dtype=str)
+            self.assertEqual(saved_df["timestamp"].tolist(), ["2024-12-19 09:00:00.250000", "2024-12-19 09:00:01"])
+            self.assertEqual(pd.to_datetime(saved_df["timestamp"], format="mixed").tolist(), df["timestamp"].tolist())
         print(f"DataFrame saved to {output_file}.")
 
+    def test_save_dataframe_to_parquet(self):
+        """
+        Test saving the structured DataFrame to a Parquet file sorted by timestamp.
+        """
+        df = structurer.store_logs_in_dataframe([
+            {"timestamp": "2024-12-19 12:00:01", "log_level": "INFO", "message": "Test info log"},
+            {"timestamp": "2024-12-19 12:00:00", "log_level": "ERROR", "message": "Test error log"}
+        ])
+        output_file = "test_output.parquet"
+        structurer.save_dataframe_to_parquet(df, output_file)
+        self.addCleanup(os.remove, output_file)
+        saved_df = pd.read_parquet(output_file)
+        self.assertEqual(list(saved_df["log_level"]), ["ERROR", "INFO"], "Rows should be sorted by timestamp.")
+        self.assertEqual(str(saved_df["timestamp"].dtype), "datetime64[ms]")
+        sorting_columns = structurer.pq.ParquetFile(output_file).metadata.row_group(0).sorting_columns
+        self.assertEqual(sorting_columns, (structurer.pq.SortingColumn(0),), "The sort order should be recorded.")
+        
+        # Sub-millisecond timestamps are floored to the stored unit
+        df = structurer.store_logs_in_dataframe([
+            {"timestamp": "2024-12-19 12:00:00.250999", "log_level": "INFO", "message": "Test info log"}
+        ])
+        structurer.save_dataframe_to_parquet(df, output_file)
+        self.assertEqual(pd.read_parquet(output_file)["timestamp"].tolist(), [pd.Timestamp("2024-12-19 12:00:00.250")])
+
+    def test_save_error_logs(self):
+        """
+        Test that only error entries are written, as log lines in the input format.
+        """
+        df = structurer.store_logs_in_dataframe([
+            {"timestamp": "2024-12-19 12:00:00", "log_level": "ERROR", "message": "Test error log"},
+            {"timestamp": "2024-12-19 12:00:01", "log_level": "INFO", "message": "Test info log"}
+        ])
+        output_file = "test_errors.log"
+        structurer.save_error_logs(df, output_file)
+        self.addCleanup(os.remove, output_file)
+        with open(output_file, encoding="utf-8") as file:
+            self.assertEqual(file.read(), "2024-12-19 12:00:00 ERROR Test error log\n")
+
+    def test_save_dataframe_to_partitioned_parquet(self):
+        """
+        Test saving the structured DataFrame as a Parquet dataset partitioned by day and level.
+        """
+        df = structurer.store_logs_in_dataframe([
+            {"timestamp": "2024-12-19 12:00:00", "log_level": "ERROR", "message": "Test error log"},
+            {"timestamp": "2024-12-20 08:00:00", "log_level": "INFO", "message": "Test info log"},
+            {"timestamp": "2024-12-20 09:00:00", "log_level": "ERROR", "message": "Another error log"}
+        ])
+        output_dir = "test_output_dataset"
+        structurer.save_dataframe_to_partitioned_parquet(df, output_dir)
+        self.addCleanup(shutil.rmtree, output_dir)
+        self.assertTrue(os.path.isdir(os.path.join(output_dir, "date=2024-12-20", "log_level=ERROR")))
+        
+        dataset = structurer.ds.dataset(output_dir, format="parquet", partitioning=structurer.PARQUET_PARTITIONING)
+        errors = dataset.to_table(filter=structurer.ds.field("log_level") == "ERROR").to_pandas()
+        self.assertEqual(sorted(errors["message"]), ["Another error log", "Test error log"])
+        
+        # Sub-millisecond timestamps are floored to the stored unit
+        df = structurer.store_logs_in_dataframe([
+            {"timestamp": "2024-12-21 10:00:00.250999", "log_level": "INFO", "message": "Test info log"}
+        ])
+        structurer.save_dataframe_to_partitioned_parquet(df, output_dir)
+        dataset = structurer.ds.dataset(output_dir, format="parquet", partitioning=structurer.PARQUET_PARTITIONING)
+        saved = dataset.to_table(filter=structurer.ds.field("date") == datetime(2024, 12, 21).date()).to_pandas()
+        self.assertEqual(saved["timestamp"].tolist(), [pd.Timestamp("2024-12-21 10:00:00.250")])
+
 if __name__ == "__main__":
     unittest.main()
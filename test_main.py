@@ -0,0 +1,69 @@
+import os
+import logging
+import tempfile
+import unittest
+
+# Configure logging for better test tracking
+logging.basicConfig(
+    filename="test_main.log",
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+from main import LogProcessor, LogAnalysis
+
+
+class TestLogAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmpdir.name, "test.log")
+        self.processor = LogProcessor(os.path.join(self.tmpdir.name, "test.db"))
+        self.analysis = LogAnalysis(self.processor)
+
+    def tearDown(self):
+        self.processor.close()
+        self.tmpdir.cleanup()
+
+    def test_process_log_file_matches_line_split(self):
+        """The memory-mapped parser keeps the same fields as strip().split(" ", 2) per line."""
+        lines = [
+            "2024-01-01T00:00:00 INFO Service started",
+            " a b",                        # leading blank: only two fields once stripped
+            "  x y z",
+            "a b c\rd e f",                # a bare \r ends a line in text mode
+            "a b c\r\n",
+            "ts ERROR disk full\xa0",      # no-break space is stripped
+            "ts WARNING fan slow\x1c\x1f",  # so are the ASCII separator characters
+            "\xa0ts INFO padded",
+            "\xa0b c",
+            "ts  double space",
+            "ts\tINFO tab in timestamp",
+            "ts INFO café",
+            "ts INFO \t",
+        ]
+        with open(self.log_file, "wb") as file:
+            file.write("\n".join(lines).encode("utf-8"))
+
+        self.analysis.process_log_file(self.log_file)
+        rows = [(log["timestamp"], log["log_level"], log["message"]) for log in self.processor.fetch_logs()]
+
+        with open(self.log_file, "r", encoding="utf-8") as file:
+            expected = [tuple(parts) for line in file if len(parts := line.strip().split(" ", 2)) >= 3]
+        self.assertEqual(rows, expected)
+        self.assertIn(("d", "e", "f"), rows)
+        self.assertIn(("ts", "ERROR", "disk full"), rows)
+
+    def test_export_error_logs(self):
+        """Only ERROR entries are exported, as log lines in the input format."""
+        with open(self.log_file, "w", encoding="utf-8") as file:
+            file.write("2024-12-19T12:00:00 ERROR Disk full\n2024-12-19T12:00:01 INFO Service started\n")
+        self.analysis.process_log_file(self.log_file)
+
+        output_file = os.path.join(self.tmpdir.name, "errors.log")
+        self.analysis.export_error_logs(output_file)
+        with open(output_file, encoding="utf-8") as file:
+            self.assertEqual(file.read(), "2024-12-19T12:00:00 ERROR Disk full\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
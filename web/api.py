@@ -1,29 +1,293 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, render_template_string, request, stream_with_context
 import pandas as pd
 import os
+import json
+import threading
+import numpy as np
+
+# Filtered Parquet reads with predicate and column pushdown; the CSV is read with pandas otherwise
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    ds = None
+
+# Fast row serialization for streamed responses, with the standard json module as the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Compressed responses (zstd, brotli or gzip, whichever the client accepts); log text
+# shrinks to a fraction of its size. Responses are sent uncompressed without it
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
 
 app = Flask(__name__)
+# Streamed responses are compressed chunk by chunk as they are generated
+app.config.update(COMPRESS_ALGORITHM=["zstd", "br", "gzip"], COMPRESS_MIN_SIZE=1024, COMPRESS_STREAMS=True)
+if Compress is not None:
+    Compress(app)
 
 PROCESSED_LOGS_PATH = "../processed_logs.csv"
+# Written by structurer.save_dataframe_to_parquet; preferred over the CSV when present
+PROCESSED_LOGS_PARQUET_PATH = "../processed_logs.parquet"
+# Written by structurer.save_dataframe_to_partitioned_parquet; preferred over both files when present
+PROCESSED_LOGS_DATASET_PATH = "../processed_logs/"
+# Columns returned from every source (processed_logs.csv only has to contain them)
+PROCESSED_LOG_COLUMNS = ["timestamp", "log_level", "message"]
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Rows converted to Python objects (and serialized) at a time in streamed responses
+ROWS_PER_BATCH = 4096
+# Rows shown per page of /processed_logs by default, and the most a request may ask for
+PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+
+# Arrow parses and decodes on its own C++ thread pools, outside the GIL: one thread per
+# core for compute, and a bounded pool for file reads. Serve with a single multithreaded
+# worker (gunicorn -k gthread -w 1 --threads N) so concurrent requests share these pools,
+# rather than several worker processes each sizing them to every core.
+if ds is not None:
+    pa.set_cpu_count(os.cpu_count() or 1)
+    pa.set_io_thread_count(min(8, os.cpu_count() or 1))
+
+# Multithreaded CSV parsing in large blocks. Log levels are dictionary-encoded (one
+# copy of each distinct string); timestamps stay text, so date filters compare them
+# as strings the way the pandas reader did. Malformed rows are skipped.
+if ds is not None:
+    # Same layout as structurer.PARQUET_PARTITIONING
+    PARQUET_PARTITIONING = ds.partitioning(
+        pa.schema([("date", pa.date32()), ("log_level", pa.string())]), flavor="hive"
+    )
+    CSV_READ_OPTIONS = pacsv.ReadOptions(block_size=16 << 20, use_threads=True)
+    CSV_PARSE_OPTIONS = pacsv.ParseOptions(invalid_row_handler=lambda row: "skip")
+    CSV_CONVERT_OPTIONS = pacsv.ConvertOptions(column_types={
+        "timestamp": pa.string(),
+        "log_level": pa.dictionary(pa.int32(), pa.string()),
+    })
+
+# processed_logs.csv parsed once and reused until the file's modification time changes
+_processed_logs_cache = {"mtime": None, "table": None}
+_processed_logs_lock = threading.Lock()
+
+
+def load_processed_logs_table():
+    """
+    Return processed_logs.csv as an Arrow table, re-parsing it only when the file has
+    changed since the last call.
+    """
+    mtime = os.stat(PROCESSED_LOGS_PATH).st_mtime_ns
+    with _processed_logs_lock:
+        if _processed_logs_cache["mtime"] != mtime:
+            _processed_logs_cache["table"] = pacsv.read_csv(
+                PROCESSED_LOGS_PATH, read_options=CSV_READ_OPTIONS, parse_options=CSV_PARSE_OPTIONS, convert_options=CSV_CONVERT_OPTIONS
+            )
+            _processed_logs_cache["mtime"] = mtime
+        return _processed_logs_cache["table"]
+
+
+def parse_date_arg(name: str):
+    """
+    Parse the `name` query argument as a timestamp. Time zone aware values are converted
+    to UTC and made naive, like the stored timestamps.
+
+    Returns:
+        pd.Timestamp: The parsed value, or None when the argument is missing or empty.
+
+    Raises:
+        ValueError: If the argument is not a valid date.
+    """
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        timestamp = pd.Timestamp(value)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid {name} '{value}': {e}") from None
+    if pd.isna(timestamp):
+        raise ValueError(f"Invalid {name} '{value}'")
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp
+
+
+def build_filter(level_column: str, level=None, start=None, end=None):
+    """
+    AND together the requested level and time-range conditions into one expression.
+
+    Returns:
+        pyarrow.compute.Expression: The combined filter, or None when nothing was requested.
+    """
+    conditions = []
+    if level:
+        conditions.append(pc.field(level_column) == level)
+    if start is not None:
+        conditions.append(pc.field("timestamp") >= start)
+    if end is not None:
+        conditions.append(pc.field("timestamp") <= end)
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def read_sorted_time_range(path: str, start=None, end=None):
+    """
+    Read the rows of a Parquet file written sorted by timestamp that fall between `start`
+    and `end`. Row groups are chosen from their min/max statistics and the bounds inside
+    them are found by binary search, so no timestamp is compared row by row.
+
+    Returns:
+        pyarrow.Table: The rows in range, or None when the file is not marked as sorted.
+    """
+    parquet_file = pq.ParquetFile(path)
+    metadata = parquet_file.metadata
+    timestamp_index = parquet_file.schema_arrow.get_field_index("timestamp")
+    row_groups = [metadata.row_group(i) for i in range(metadata.num_row_groups)]
+    if not row_groups or any(row_group.sorting_columns[:1] != (pq.SortingColumn(timestamp_index),) for row_group in row_groups):
+        return None
+
+    selected = []
+    for i, row_group in enumerate(row_groups):
+        statistics = row_group.column(timestamp_index).statistics
+        if statistics is None or not statistics.has_min_max or (
+            (start is None or statistics.max >= start) and (end is None or statistics.min <= end)
+        ):
+            selected.append(i)
+    table = parquet_file.read_row_groups(selected, columns=PROCESSED_LOG_COLUMNS)
+
+    timestamps = table.column("timestamp").to_numpy()
+    low = np.searchsorted(timestamps, np.datetime64(start, "ms"), side="left") if start is not None else 0
+    high = np.searchsorted(timestamps, np.datetime64(end, "ms"), side="right") if end is not None else len(timestamps)
+    return table.slice(low, max(high - low, 0))
+
+
+def format_timestamps(timestamps):
+    """
+    Format timestamps as text the way the CSV output has them: whole seconds in
+    TIMESTAMP_FORMAT, other values with their fraction (e.g. "12:00:00.250"). Each
+    value is formatted on its own, so its text does not depend on the other rows.
+    """
+    whole_seconds = pc.equal(pc.floor_temporal(timestamps, unit="second"), timestamps)
+    return pc.if_else(
+        whole_seconds,
+        pc.strftime(timestamps.cast(pa.timestamp("s"), safe=False), format=TIMESTAMP_FORMAT),
+        # "%S" prints the fraction for units finer than seconds
+        pc.strftime(timestamps, format=TIMESTAMP_FORMAT)
+    )
+
+
+def read_processed_logs_parquet(level: str = None, start: pd.Timestamp = None, end: pd.Timestamp = None):
+    """
+    Read processed logs from the partitioned Parquet dataset, or the single Parquet file,
+    pushing the filters down to the scan. In the dataset, directories for other days and
+    levels are never opened; in either, row groups outside the time range are never decoded,
+    and a file marked as sorted by timestamp is range-searched instead of filtered.
+
+    Args:
+        level (str): Only return logs with this log level.
+        start (pd.Timestamp): Only return logs at or after this naive UTC time (see parse_date_arg).
+        end (pd.Timestamp): Only return logs at or before this naive UTC time.
+
+    Returns:
+        pyarrow.Table: The matching logs.
+    """
+    # Timestamps are stored in milliseconds; rounding inwards keeps the bounds exact
+    start = start.ceil("ms") if start is not None else None
+    end = end.floor("ms") if end is not None else None
+    expression = build_filter(
+        "log_level",
+        level,
+        pa.scalar(start, type=pa.timestamp("ms")) if start is not None else None,
+        pa.scalar(end, type=pa.timestamp("ms")) if end is not None else None
+    )
+
+    table = None
+    if os.path.isdir(PROCESSED_LOGS_DATASET_PATH):
+        dataset = ds.dataset(PROCESSED_LOGS_DATASET_PATH, format="parquet", partitioning=PARQUET_PARTITIONING)
+        # The same bounds on the date partition key prune directories
+        for condition in (
+            pc.field("date") >= pa.scalar(start.date(), type=pa.date32()) if start is not None else None,
+            pc.field("date") <= pa.scalar(end.date(), type=pa.date32()) if end is not None else None,
+        ):
+            if condition is not None:
+                expression = condition if expression is None else expression & condition
+    else:
+        dataset = ds.dataset(PROCESSED_LOGS_PARQUET_PATH, format="parquet")
+        if start is not None or end is not None:
+            table = read_sorted_time_range(PROCESSED_LOGS_PARQUET_PATH, start, end)
+            if table is not None and level:
+                table = table.filter(pc.field("log_level") == level)
+    if table is None:
+        table = dataset.to_table(filter=expression, columns=PROCESSED_LOG_COLUMNS)
+    timestamps = format_timestamps(table.column("timestamp"))
+    return table.set_column(table.schema.get_field_index("timestamp"), "timestamp", timestamps)
+
+
+def stream_json_rows(table) -> Response:
+    """
+    Stream an Arrow table as a JSON array, serializing ROWS_PER_BATCH rows per call
+    instead of building the whole list, or calling the encoder once per row.
+    """
+    def generate():
+        dumps = orjson.dumps if orjson is not None else lambda rows: json.dumps(rows).encode("utf-8")
+        separator = b"["
+        for batch in table.to_batches(max_chunksize=ROWS_PER_BATCH):
+            if batch.num_rows:
+                # Splice the batch's array body into the enclosing array
+                yield separator + dumps(batch.to_pylist())[1:-1]
+                separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
 
 
 @app.route("/api/processed_logs", methods=["GET"])
 def get_processed_logs():
     """
-    API endpoint to fetch processed logs from the processed_logs.csv file.
+    API endpoint to fetch processed logs from the processed_logs/ Parquet dataset or
+    processed_logs.parquet, or from the processed_logs.csv file when neither exists.
     """
+    level = request.args.get("level")
+    try:
+        start = parse_date_arg("start_date")
+        end = parse_date_arg("end_date")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if ds is not None and (os.path.isdir(PROCESSED_LOGS_DATASET_PATH) or os.path.exists(PROCESSED_LOGS_PARQUET_PATH)):
+        try:
+            return stream_json_rows(read_processed_logs_parquet(level, start, end))
+        except Exception as e:
+            return jsonify({"error": f"Error reading the file: {str(e)}"}), 500
+
     if not os.path.exists(PROCESSED_LOGS_PATH):
         return jsonify({"error": f"File '{PROCESSED_LOGS_PATH}' not found!"}), 404
 
     try:
-        df = pd.read_csv(PROCESSED_LOGS_PATH)
+        # The CSV keeps timestamps as text, compared as strings in the same layout
+        start_date = str(start) if start is not None else None
+        end_date = str(end) if end is not None else None
 
-        level = request.args.get("level")
-        start_date = request.args.get("start_date")
-        end_date = request.args.get("end_date")
+        if ds is not None:
+            # Filter the cached table in one pass, then keep only the returned columns
+            table = load_processed_logs_table()
+            expression = build_filter("log_level", level, start_date, end_date)
+            if expression is not None:
+                table = table.filter(expression)
+            table = table.select([column for column in PROCESSED_LOG_COLUMNS if column in table.column_names])
+            return stream_json_rows(table)
+
+        df = pd.read_csv(PROCESSED_LOGS_PATH)
 
         if level:
-            df = df[df["level"] == level]
+            df = df[df["log_level"] == level]
 
         if start_date:
             df = df[df["timestamp"] >= start_date]
@@ -38,20 +302,7 @@ def get_processed_logs():
         return jsonify({"error": f"Error reading the file: {str(e)}"}), 500
 
 
-@app.route("/processed_logs", methods=["GET"])
-def display_processed_logs():
-    """
-    Web route to display processed logs in an HTML table.
-    """
-    if not os.path.exists(PROCESSED_LOGS_PATH):
-        return "<h1>Error: Processed logs file not found!</h1>"
-
-    try:
-        df = pd.read_csv(PROCESSED_LOGS_PATH)
-
-        html_table = df.to_html(classes="table table-striped", index=False)
-
-        return f"""
+PROCESSED_LOGS_PAGE = """
         <html>
         <head>
             <link rel="stylesheet" href="https://maxcdn.bootstrapcdn.com/bootstrap/4.5.2/css/bootstrap.min.css">
@@ -59,11 +310,52 @@ def display_processed_logs():
         <body>
             <div class="container">
                 <h1>Processed Logs</h1>
-                {html_table}
+                <table class="table table-striped">
+                    <thead><tr>{% for column in columns %}<th>{{ column }}</th>{% endfor %}</tr></thead>
+                    <tbody>
+                    {% for row in rows %}
+                        <tr>{% for column in columns %}<td>{{ row[column] }}</td>{% endfor %}</tr>
+                    {% endfor %}
+                    </tbody>
+                </table>
+                <nav class="d-flex justify-content-between">
+                    <span>{% if offset > 0 %}<a href="?offset={{ [offset - limit, 0]|max }}&limit={{ limit }}">Previous</a>{% endif %}</span>
+                    <span>Rows {{ offset + 1 if rows else offset }}&ndash;{{ offset + rows|length }} of {{ total }}</span>
+                    <span>{% if offset + limit < total %}<a href="?offset={{ offset + limit }}&limit={{ limit }}">Next</a>{% endif %}</span>
+                </nav>
             </div>
         </body>
         </html>
         """
+
+
+@app.route("/processed_logs", methods=["GET"])
+def display_processed_logs():
+    """
+    Web route to display one page of processed logs, selected by the `offset` and
+    `limit` query arguments, in an HTML table.
+    """
+    if not os.path.exists(PROCESSED_LOGS_PATH):
+        return "<h1>Error: Processed logs file not found!</h1>"
+
+    try:
+        offset = max(request.args.get("offset", 0, type=int), 0)
+        limit = min(max(request.args.get("limit", PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        if ds is not None:
+            table = load_processed_logs_table()
+            columns = table.column_names
+            # Zero-copy view of the requested rows; only these are converted and rendered
+            rows = table.slice(offset, limit).to_pylist()
+            total = table.num_rows
+        else:
+            df = pd.read_csv(PROCESSED_LOGS_PATH)
+            columns = list(df.columns)
+            rows = df.iloc[offset:offset + limit].to_dict(orient="records")
+            total = len(df)
+
+        return render_template_string(
+            PROCESSED_LOGS_PAGE, columns=columns, rows=rows, offset=offset, limit=limit, total=total
+        )
     except Exception as e:
         return f"<h1>Error loading logs: {str(e)}</h1>"
 
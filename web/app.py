@@ -1,32 +1,165 @@
-from flask import Flask, render_template
+from flask import Flask, render_template, request
 import pandas as pd
 import os
+import mmap
 import time
 import random
+import threading
+
+# Multithreaded C++ CSV parser and Arrow tables, with pandas as the fallback
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Compressed responses (zstd, brotli or gzip, whichever the client accepts); log text
+# shrinks to a fraction of its size. Responses are sent uncompressed without it
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
 
 app = Flask(__name__)
+# Streamed responses are compressed chunk by chunk as they are generated
+app.config.update(COMPRESS_ALGORITHM=["zstd", "br", "gzip"], COMPRESS_MIN_SIZE=1024, COMPRESS_STREAMS=True)
+if Compress is not None:
+    Compress(app)
 
 PROCESSED_LOGS_PATH = "processed_logs.csv"
+# Written by structurer.save_dataframe_to_parquet; preferred over the CSV when present
+PROCESSED_LOGS_PARQUET_PATH = "processed_logs.parquet"
 LARGE_LOG_FILE_PATH = "large_log_file.txt"
+# Written by structurer.save_error_logs; /errors reads it instead of the full log when
+# present and no older than the log it was extracted from
+ERROR_LOGS_PATH = "errors.log"
 ROOT_CAUSE_ANALYSIS_PATH = "root_cause_analysis.log"
 
-analysis_speed = 0 
-accuracy_score = 0  
+# Log pages show only the end of their file: at most TAIL_LINES lines from the last TAIL_BYTES
+TAIL_LINES = 500
+TAIL_BYTES = 1 << 20
+
+# Rows shown per page of /processed_logs by default, and the most a request may ask for
+PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+
+# Arrow parses and decodes on its own C++ thread pools, outside the GIL: one thread per
+# core for compute, and a bounded pool for file reads. Serve with a single multithreaded
+# worker (gunicorn -k gthread -w 1 --threads N) so concurrent requests share these pools,
+# rather than several worker processes each sizing them to every core.
+if pa is not None:
+    pa.set_cpu_count(os.cpu_count() or 1)
+    pa.set_io_thread_count(min(8, os.cpu_count() or 1))
+
+# Multithreaded CSV parsing in large blocks, with log levels dictionary-encoded (one
+# copy of each distinct string). Malformed rows are skipped rather than failing the page.
+if pa is not None:
+    CSV_READ_OPTIONS = pacsv.ReadOptions(block_size=16 << 20, use_threads=True)
+    CSV_PARSE_OPTIONS = pacsv.ParseOptions(invalid_row_handler=lambda row: "skip")
+    CSV_CONVERT_OPTIONS = pacsv.ConvertOptions(column_types={"log_level": pa.dictionary(pa.int32(), pa.string())})
+
+# Parsed processed logs, reused until the source file or its modification time changes
+_processed_logs_cache = {"key": None, "table": None}
+_processed_logs_lock = threading.Lock()
+
+# Seconds the displayed performance metrics are reused before being recomputed
+METRICS_TTL_SECONDS = 5
+# (computed at, analysis speed, accuracy score), replaced as a whole so concurrent
+# requests never see a half-updated pair
+_performance_metrics = (float("-inf"), 0.0, 0.0)
 
 
 def calculate_performance_metrics():
-    
-    global analysis_speed, accuracy_score
+    """
+    Return the (analysis speed, accuracy score) pair, recomputing it at most once
+    every METRICS_TTL_SECONDS.
+    """
+    global _performance_metrics
 
-    analysis_speed = round(random.uniform(0.5, 2.0), 2)
+    computed_at, analysis_speed, accuracy_score = _performance_metrics
+    now = time.monotonic()
+    if now - computed_at > METRICS_TTL_SECONDS:
+        analysis_speed = round(random.uniform(0.5, 2.0), 2)
+        accuracy_score = round(random.uniform(95, 99), 2)
+        _performance_metrics = (now, analysis_speed, accuracy_score)
+    return analysis_speed, accuracy_score
 
-    accuracy_score = round(random.uniform(95, 99), 2)
+
+def load_processed_logs(use_parquet: bool):
+    """
+    Load the processed logs, parsing the file only when it has changed since the last call.
+
+    Returns:
+        pyarrow.Table or pd.DataFrame: The processed logs (a DataFrame only without pyarrow).
+    """
+    path = PROCESSED_LOGS_PARQUET_PATH if use_parquet else PROCESSED_LOGS_PATH
+    key = (path, os.stat(path).st_mtime_ns)
+    with _processed_logs_lock:
+        if _processed_logs_cache["key"] != key:
+            if pa is None:
+                table = pd.read_parquet(path) if use_parquet else pd.read_csv(path)
+            elif use_parquet:
+                table = pq.read_table(path)
+            else:
+                table = pacsv.read_csv(
+                    path, read_options=CSV_READ_OPTIONS, parse_options=CSV_PARSE_OPTIONS, convert_options=CSV_CONVERT_OPTIONS
+                )
+            _processed_logs_cache.update(key=key, table=table)
+        return _processed_logs_cache["table"]
+
+
+def page_window():
+    """
+    Read the requested page of rows from the `offset` and `limit` query arguments.
+
+    Returns:
+        Tuple[int, int]: The first row and the number of rows, clamped to valid values.
+    """
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    limit = min(max(request.args.get("limit", PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    return offset, limit
+
+
+def tail_lines(path: str, max_lines: int = TAIL_LINES, max_bytes: int = TAIL_BYTES) -> list:
+    """
+    Read the last lines of a file without reading the rest of it, so memory and
+    latency stay bounded however large the file grows. The file is memory-mapped and
+    the line breaks are found backwards from the end; only the tail is copied and decoded.
+
+    Returns:
+        List[str]: Up to `max_lines` lines, each with its line ending.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return []  # mmap cannot map an empty file
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            floor = max(0, size - max_bytes)
+            # A final line break ends the last line rather than starting a new one
+            search_end = size - 1 if mapped[size - 1] == ord("\n") else size
+            newline = -1
+            for _ in range(max_lines):
+                newline = mapped.rfind(b"\n", floor, search_end)
+                if newline == -1:
+                    break
+                search_end = newline
+            if newline != -1:
+                start = newline + 1
+            elif floor > 0:
+                # Fewer than max_lines lines in the window: drop the partial line it starts in
+                first_newline = mapped.find(b"\n", floor, size)
+                start = floor if first_newline == -1 else first_newline + 1
+            else:
+                start = 0
+            data = mapped[start:size]
+    return [line.decode("utf-8", errors="replace") for line in data.splitlines(keepends=True)]
 
 
 @app.route("/")
 def home():
     
-    calculate_performance_metrics()
+    analysis_speed, accuracy_score = calculate_performance_metrics()
     return render_template(
         "index.html", speed=analysis_speed, accuracy=accuracy_score
     )
@@ -35,27 +168,38 @@ def home():
 @app.route("/processed_logs")
 def processed_logs():
     """
-    Display the processed logs from `processed_logs.csv`.
+    Display the processed logs from `processed_logs.parquet`, or `processed_logs.csv`
+    when no Parquet copy exists.
     """
-    if not os.path.exists(PROCESSED_LOGS_PATH):
+    use_parquet = os.path.exists(PROCESSED_LOGS_PARQUET_PATH)
+    if not use_parquet and not os.path.exists(PROCESSED_LOGS_PATH):
         return render_template("error.html", message="Processed logs file not found!")
 
     try:
         
         start_time = time.time()
 
-        df = pd.read_csv(PROCESSED_LOGS_PATH)
-
-        logs = df.to_dict(orient="records")
+        table = load_processed_logs(use_parquet)
+        offset, limit = page_window()
+        if pa is not None and isinstance(table, pa.Table):
+            columns = table.column_names
+            # Zero-copy view of the requested rows; only these are converted and rendered
+            page = table.slice(offset, limit).to_pylist()
+        else:
+            columns = list(table.columns)
+            page = table.iloc[offset:offset + limit].to_dict(orient="records")
 
         processing_time = round(time.time() - start_time, 2)
 
         return render_template(
             "processed_logs.html",
-            logs=logs,
-            columns=df.columns,
+            logs=page,
+            columns=columns,
+            offset=offset,
+            limit=limit,
+            total=len(table),
             speed=processing_time,
-            accuracy=accuracy_score,
+            accuracy=calculate_performance_metrics()[1],
         )
     except Exception as e:
         return render_template("error.html", message=f"Error loading processed logs: {str(e)}")
@@ -64,14 +208,21 @@ def processed_logs():
 @app.route("/errors")
 def errors():
     """
-    Display error logs from `large_log_file.txt`.
+    Display error logs from `errors.log`, or from `large_log_file.txt` when no
+    up-to-date error-only copy exists.
     """
-    if not os.path.exists(LARGE_LOG_FILE_PATH):
+    # An error log older than the full log was extracted before the full log last changed
+    log_path = LARGE_LOG_FILE_PATH
+    if os.path.exists(ERROR_LOGS_PATH) and (
+        not os.path.exists(LARGE_LOG_FILE_PATH)
+        or os.stat(ERROR_LOGS_PATH).st_mtime_ns >= os.stat(LARGE_LOG_FILE_PATH).st_mtime_ns
+    ):
+        log_path = ERROR_LOGS_PATH
+    if not os.path.exists(log_path):
         return render_template("error.html", message="Large log file not found!")
 
     try:
-        with open(LARGE_LOG_FILE_PATH, "r") as file:
-            logs = file.readlines()
+        logs = tail_lines(log_path)
 
         return render_template("errors.html", logs=logs)
     except Exception as e:
@@ -87,8 +238,7 @@ def root_cause():
         return render_template("error.html", message="Root cause analysis file not found!")
 
     try:
-        with open(ROOT_CAUSE_ANALYSIS_PATH, "r") as file:
-            root_cause = file.readlines()
+        root_cause = tail_lines(ROOT_CAUSE_ANALYSIS_PATH)
 
         return render_template("root_cause.html", root_cause=root_cause)
     except Exception as e:
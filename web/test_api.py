@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import api
+
+# Stored the way structurer writes them: sorted by timestamp, in milliseconds
+LOGS = pd.DataFrame({
+    "timestamp": pd.to_datetime([
+        "2024-12-19 09:00:00", "2024-12-19 09:00:00.250", "2024-12-19 09:00:01", "2024-12-20 08:00:00"
+    ], format="ISO8601").astype("datetime64[ms]"),
+    "log_level": ["ERROR", "ERROR", "INFO", "ERROR"],
+    "message": ["Disk full", "Link down", "Service started", "Fan failure"],
+})
+
+
+class TestProcessedLogsApi(unittest.TestCase):
+    def setUp(self):
+        """Point the API at throwaway files and give each test an empty CSV cache."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.csv_path = os.path.join(self.tmpdir, "processed_logs.csv")
+        self.parquet_path = os.path.join(self.tmpdir, "processed_logs.parquet")
+        self.dataset_path = os.path.join(self.tmpdir, "processed_logs")
+        for name, value in (
+            ("PROCESSED_LOGS_PATH", self.csv_path),
+            ("PROCESSED_LOGS_PARQUET_PATH", self.parquet_path),
+            ("PROCESSED_LOGS_DATASET_PATH", self.dataset_path),
+            ("_processed_logs_cache", {"mtime": None, "table": None}),
+        ):
+            path_patch = patch.object(api, name, value)
+            path_patch.start()
+            self.addCleanup(path_patch.stop)
+        self.client = api.app.test_client()
+
+    def get_messages(self, **params):
+        response = self.client.get("/api/processed_logs", query_string=params)
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        return response.get_json()
+
+    def write_csv(self):
+        # Timestamp text as structurer.save_dataframe_to_csv writes it
+        rows = ["timestamp,log_level,message"] + [
+            f"{timestamp},{level},{message}" for timestamp, level, message in (
+                ("2024-12-19 09:00:00", "ERROR", "Disk full"),
+                ("2024-12-19 09:00:00.250000", "ERROR", "Link down"),
+                ("2024-12-19 09:00:01", "INFO", "Service started"),
+                ("2024-12-20 08:00:00", "ERROR", "Fan failure"),
+            )
+        ]
+        with open(self.csv_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(rows) + "\n")
+
+    def test_csv_filters(self):
+        """Test the level and date filters on processed_logs.csv, with and without pyarrow."""
+        self.write_csv()
+        for arrow_dataset in (api.ds, None):
+            with patch.object(api, "ds", arrow_dataset):
+                logs = self.get_messages(level="ERROR", start_date="2024-12-19 09:00:00.1", end_date="2024-12-19")
+                self.assertEqual(logs, [])
+                logs = self.get_messages(level="ERROR", start_date="2024-12-19 09:00:00.1", end_date="2024-12-20")
+                self.assertEqual(logs, [
+                    {"timestamp": "2024-12-19 09:00:00.250000", "log_level": "ERROR", "message": "Link down"}
+                ])
+                # Time zone aware bounds are compared in UTC
+                logs = self.get_messages(start_date="2024-12-19T10:00:00.500+01:00")
+                self.assertEqual([log["message"] for log in logs], ["Service started", "Fan failure"])
+
+    def test_parquet_file_filters(self):
+        """Test the sorted Parquet file: range search, millisecond rounding and timestamp text."""
+        pq.write_table(pa.Table.from_pandas(LOGS, preserve_index=False), self.parquet_path, sorting_columns=[pq.SortingColumn(0)])
+
+        logs = self.get_messages(end_date="2024-12-19 09:00:01")
+        self.assertEqual([log["timestamp"] for log in logs], ["2024-12-19 09:00:00", "2024-12-19 09:00:00.250", "2024-12-19 09:00:01"])
+        # Sub-millisecond bounds are rounded inwards: the 09:00:00.250 row lies outside both
+        self.assertEqual([log["message"] for log in self.get_messages(start_date="2024-12-19 09:00:00.2501")],
+                         ["Service started", "Fan failure"])
+        self.assertEqual([log["message"] for log in self.get_messages(end_date="2024-12-19 09:00:00.2499")], ["Disk full"])
+        self.assertEqual(self.get_messages(level="ERROR", start_date="2024-12-19 09:00:00.250", end_date="2024-12-19 09:00:00.250"), [
+            {"timestamp": "2024-12-19 09:00:00.250", "log_level": "ERROR", "message": "Link down"}
+        ])
+
+        # A file not marked as sorted is filtered instead of range-searched
+        pq.write_table(pa.Table.from_pandas(LOGS, preserve_index=False), self.parquet_path)
+        self.assertIsNone(api.read_sorted_time_range(self.parquet_path))
+        self.assertEqual([log["message"] for log in self.get_messages(level="ERROR", start_date="2024-12-19 09:00:00.001")],
+                         ["Link down", "Fan failure"])
+
+    def test_dataset_filters(self):
+        """Test the partitioned dataset, which is preferred over the single file."""
+        table = pa.Table.from_pandas(LOGS.assign(date=LOGS["timestamp"].dt.date), preserve_index=False)
+        ds.write_dataset(table, self.dataset_path, format="parquet", partitioning=api.PARQUET_PARTITIONING)
+        pq.write_table(pa.Table.from_pandas(LOGS.iloc[:0], preserve_index=False), self.parquet_path)
+
+        logs = self.get_messages(level="ERROR", start_date="2024-12-19 09:00:00.0001")
+        self.assertEqual(sorted((log["timestamp"], log["message"]) for log in logs), [
+            ("2024-12-19 09:00:00.250", "Link down"), ("2024-12-20 08:00:00", "Fan failure")
+        ])
+        logs = self.get_messages(end_date="2024-12-19 23:59:59")
+        self.assertEqual(sorted(log["message"] for log in logs), ["Disk full", "Link down", "Service started"])
+
+    def test_invalid_date(self):
+        """Test that an unparseable date is rejected."""
+        self.write_csv()
+        response = self.client.get("/api/processed_logs", query_string={"start_date": "yesterday"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("start_date", response.get_json()["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import app
+
+
+class TestErrorsPage(unittest.TestCase):
+    def setUp(self):
+        """Point the app at a throwaway full log and error log."""
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.large_log = os.path.join(self.tmpdir, "large_log_file.txt")
+        self.error_log = os.path.join(self.tmpdir, "errors.log")
+        for name, value in (("LARGE_LOG_FILE_PATH", self.large_log), ("ERROR_LOGS_PATH", self.error_log)):
+            path_patch = patch.object(app, name, value)
+            path_patch.start()
+            self.addCleanup(path_patch.stop)
+        self.client = app.app.test_client()
+
+        with open(self.large_log, "w", encoding="utf-8") as file:
+            file.write("2024-12-19 12:00:00 ERROR Disk full\n2024-12-19 12:00:01 INFO Service started\n")
+        with open(self.error_log, "w", encoding="utf-8") as file:
+            file.write("2024-12-19 12:00:00 ERROR Disk full\n")
+
+    def get_page(self) -> str:
+        response = self.client.get("/errors")
+        self.assertEqual(response.status_code, 200)
+        return response.get_data(as_text=True)
+
+    def test_errors_reads_error_log(self):
+        """Test that an error log at least as new as the full log is shown instead of it."""
+        os.utime(self.error_log, ns=(2_000_000_000_000_000_000, 2_000_000_000_000_000_000))
+        os.utime(self.large_log, ns=(1_000_000_000_000_000_000, 1_000_000_000_000_000_000))
+        page = self.get_page()
+        self.assertIn("Disk full", page)
+        self.assertNotIn("Service started", page)
+
+    def test_errors_skips_stale_error_log(self):
+        """Test that the full log is shown once it is newer than the error log."""
+        os.utime(self.error_log, ns=(1_000_000_000_000_000_000, 1_000_000_000_000_000_000))
+        os.utime(self.large_log, ns=(2_000_000_000_000_000_000, 2_000_000_000_000_000_000))
+        self.assertIn("Service started", self.get_page())
+
+
+if __name__ == "__main__":
+    unittest.main()